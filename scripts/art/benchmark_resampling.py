@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Benchmark the staged sprite downscale path against a single-pass Lanczos resize.
+
+Both paths normalize every Kira dash/slide frame from the AR-003 evasion pack:
+the reference crops each frame and resizes it with ``Image.LANCZOS`` in one
+pass, while the staged path reduces the sheet once through ``SheetResampler``
+and finishes each frame with Lanczos. ``--upscale`` enlarges the sheet first to
+model higher-resolution generations.
+
+The JSON report records timing statistics for both paths and a quality check
+(PSNR and max channel difference of premultiplied RGBA against the reference).
+A case fails when PSNR falls below the threshold and warns when the staged path
+is slower than the reference; any failure makes the process exit non-zero.
+
+It is part of the repo's benchmark flow next to ``benchmark:layout-graph``: the
+report uses the same timing statistics and pass/warn/fail summary counts and
+lands in ``reports/perf/``. It lives here rather than under ``scripts/benchmarks/`` because it
+drives the Python art pipeline directly.
+
+Usage:
+    npm run benchmark:art-resampling -- [--upscale N[,N...]] [--iterations N]
+        [--min-psnr DB] [--out PATH]
+    python scripts/art/benchmark_resampling.py [same options]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Sequence
+
+import numpy as np
+from PIL import Image
+
+from lib.atomic_io import write_json_atomic
+from lib.pixel_cache import PixelCache
+from lib.resample import DEFAULT_REDUCING_GAP
+from normalize_kira_evasion_pack import (
+  SOURCE_PATH,
+  ComponentBox,
+  find_components,
+  frame_geometry,
+  frame_resampler,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_OUT_DIR = PROJECT_ROOT / 'reports' / 'perf'
+DEFAULT_UPSCALES = (1, 2, 4)
+DEFAULT_ITERATIONS = 5
+DEFAULT_MIN_PSNR = 40.0
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument(
+    '--upscale',
+    default=','.join(str(value) for value in DEFAULT_UPSCALES),
+    help='Comma-delimited factors the source sheet is enlarged by before each run.',
+  )
+  parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS, help='Timed iterations per path.')
+  parser.add_argument('--min-psnr', type=float, default=DEFAULT_MIN_PSNR, help='Minimum PSNR (dB) to pass.')
+  parser.add_argument('--out', type=Path, help='Output JSON path (default reports/perf/art-resampling-benchmark-<timestamp>.json).')
+  return parser.parse_args()
+
+
+def single_pass_frames(image: Image.Image, boxes: Sequence[ComponentBox]) -> List[Image.Image]:
+  frames = []
+  for box in boxes:
+    expanded, size = frame_geometry(image.size, box)
+    crop = image.crop((expanded.min_x, expanded.min_y, expanded.max_x + 1, expanded.max_y + 1))
+    frames.append(crop.resize(size, Image.LANCZOS))
+  return frames
+
+
+def staged_frames(image: Image.Image, boxes: Sequence[ComponentBox]) -> List[Image.Image]:
+  resampler = frame_resampler(image, boxes)
+  frames = []
+  for box in boxes:
+    expanded, size = frame_geometry(image.size, box)
+    rect = (expanded.min_x, expanded.min_y, expanded.max_x, expanded.max_y)
+    frames.append(resampler.resize(rect, size))
+  return frames
+
+
+def percentile(ordered: Sequence[float], p: float) -> float:
+  """Nearest-rank percentile, matching ``runLayoutGraphBenchmark.js``."""
+  if not ordered:
+    return 0.0
+  return ordered[min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def time_path(run: Callable[[], List[Image.Image]], iterations: int) -> dict:
+  durations = []
+  for _ in range(iterations):
+    start = time.perf_counter()
+    run()
+    durations.append((time.perf_counter() - start) * 1000.0)
+  ordered = sorted(durations)
+  return {
+    'min': ordered[0],
+    'max': ordered[-1],
+    'mean': statistics.fmean(durations),
+    'median': percentile(ordered, 50),
+    'p75': percentile(ordered, 75),
+    'p95': percentile(ordered, 95),
+    'p99': percentile(ordered, 99),
+    'durations': durations,
+  }
+
+
+def premultiplied(image: Image.Image) -> np.ndarray:
+  """RGBA as float premultiplied by alpha; colour under fully transparent pixels is irrelevant."""
+  pixels = np.asarray(image, dtype=np.float64).copy()
+  pixels[..., :3] *= pixels[..., 3:] / 255.0
+  return pixels
+
+
+def compare_frames(reference: Sequence[Image.Image], candidate: Sequence[Image.Image]) -> dict:
+  squared_error = 0.0
+  samples = 0
+  max_diff = 0.0
+  for expected, actual in zip(reference, candidate):
+    diff = premultiplied(expected) - premultiplied(actual)
+    squared_error += float(np.sum(diff ** 2))
+    samples += diff.size
+    max_diff = max(max_diff, float(np.abs(diff).max()))
+  mse = squared_error / max(1, samples)
+  psnr = math.inf if mse == 0 else 10.0 * math.log10(255.0 ** 2 / mse)
+  return {'mse': mse, 'psnr': psnr, 'maxChannelDiff': max_diff}
+
+
+def scale_boxes(boxes: Sequence[ComponentBox], factor: int) -> List[ComponentBox]:
+  return [
+    ComponentBox(box.min_x * factor, box.min_y * factor, (box.max_x + 1) * factor - 1, (box.max_y + 1) * factor - 1)
+    for box in boxes
+  ]
+
+
+def run_case(sheet: Image.Image, boxes: Sequence[ComponentBox], upscale: int, iterations: int, min_psnr: float) -> dict:
+  image = sheet if upscale == 1 else sheet.resize((sheet.width * upscale, sheet.height * upscale), Image.NEAREST)
+  scaled = scale_boxes(boxes, upscale)
+
+  reference = single_pass_frames(image, scaled)
+  candidate = staged_frames(image, scaled)
+  quality = compare_frames(reference, candidate)
+  quality['status'] = 'pass' if quality['psnr'] >= min_psnr else 'fail'
+
+  single = time_path(lambda: single_pass_frames(image, scaled), iterations)
+  staged = time_path(lambda: staged_frames(image, scaled), iterations)
+  speedup = single['mean'] / staged['mean'] if staged['mean'] > 0 else None
+  if quality['status'] == 'fail':
+    status = 'fail'
+  elif speedup is not None and speedup < 1.0:
+    status = 'warn'
+  else:
+    status = 'pass'
+  return {
+    'upscale': upscale,
+    'sheetSize': {'width': image.width, 'height': image.height},
+    'frames': len(scaled),
+    'reduceFactor': frame_resampler(image, scaled).factor,
+    'singlePass': single,
+    'staged': staged,
+    'speedup': speedup,
+    'quality': quality,
+    'status': status,
+  }
+
+
+def json_number(value: float):
+  return None if math.isinf(value) else value
+
+
+def main() -> None:
+  args = parse_args()
+  upscales = [int(value) for value in args.upscale.split(',') if value.strip()]
+  if not upscales or any(value < 1 for value in upscales):
+    raise SystemExit('--upscale expects positive integers')
+
+  if not SOURCE_PATH.exists():
+    raise FileNotFoundError(f'Source atlas not found: {SOURCE_PATH}')
+  sheet = PixelCache().open_rgba(SOURCE_PATH).copy()
+  boxes = find_components(sheet)
+
+  generated_at = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + 'Z'
+  results = []
+  for upscale in upscales:
+    result = run_case(sheet, boxes, upscale, max(1, args.iterations), args.min_psnr)
+    result['quality']['psnr'] = json_number(result['quality']['psnr'])
+    results.append(result)
+    psnr = result['quality']['psnr']
+    speedup = result['speedup']
+    print(
+      f'[ArtResamplingBenchmark] x{upscale} | single: {result["singlePass"]["mean"]:.2f}ms'
+      f' | staged: {result["staged"]["mean"]:.2f}ms | speedup: {"n/a" if speedup is None else f"{speedup:.2f}x"}'
+      f' | psnr: {"inf" if psnr is None else f"{psnr:.2f}"}dB | status: {result["status"]}'
+    )
+
+  report = {
+    'generatedAt': generated_at,
+    'parameters': {
+      'source': str(SOURCE_PATH.relative_to(PROJECT_ROOT)).replace('\\', '/'),
+      'upscales': upscales,
+      'iterations': args.iterations,
+      'reducingGap': DEFAULT_REDUCING_GAP,
+      'minPsnr': args.min_psnr,
+    },
+    'results': results,
+    'summary': {
+      'failures': sum(1 for entry in results if entry['status'] == 'fail'),
+      'warnings': sum(1 for entry in results if entry['status'] == 'warn'),
+      'passes': sum(1 for entry in results if entry['status'] == 'pass'),
+      'minSpeedup': min((entry['speedup'] for entry in results if entry['speedup'] is not None), default=None),
+    },
+  }
+
+  timestamp_label = generated_at.replace(':', '-').replace('.', '-')
+  output_path = args.out or DEFAULT_OUT_DIR / f'art-resampling-benchmark-{timestamp_label}.json'
+  write_json_atomic(output_path, report)
+  print(f'[ArtResamplingBenchmark] Report written to {Path(os.path.relpath(output_path))}')
+
+  if report['summary']['failures'] > 0:
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Build a hashed edge-signature index for the AR-005 tilesets.
+
+Every 16px tile side gets an exact signature and coarse segment features.
+Tiles are bucketed by ``(side, key)``, so seam validation and auto-tiling
+neighbour queries are dictionary lookups instead of pixel comparisons between
+every pair of tiles. Tolerant matches are confirmed against the edge pixels
+(see ``lib/edge_signatures.py``).
+
+The index stores each tile's keys, from which a consumer can rebuild the
+buckets; ``--buckets`` also writes the bucket tables. The default output is a
+build artefact and is git-ignored.
+
+By default the sourced tilesets under ``assets/generated/images/ar-005/`` are
+indexed. ``--placeholders`` also indexes the procedural placeholder tilesets
+from ``generate_ar_placeholders.py``, rendered in memory. ``--image`` adds any
+other atlas.
+
+Usage:
+    python scripts/art/build_tile_edge_index.py [--placeholders] [--image PATH ...]
+        [--tile-size PX] [--tolerance N] [--out PATH] [--buckets]
+        [--query TILESET#INDEX:SIDE ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from PIL import Image
+
+from lib.atomic_io import write_json_atomic
+from lib.edge_signatures import (
+    DEFAULT_TILE_SIZE,
+    DEFAULT_TOLERANCE,
+    SIDES,
+    EdgeSignatureIndex,
+    TileRef,
+)
+from lib.pixel_cache import file_digest
+
+ROOT = Path(__file__).resolve().parents[2]
+AR005_DIR = ROOT / "assets" / "generated" / "images" / "ar-005"
+INDEX_PATH = AR005_DIR / "tile-edge-index.json"
+TILESETS = (
+    "image-ar-005-tileset-neon-district",
+    "image-ar-005-tileset-corporate-spires",
+    "image-ar-005-tileset-archive-undercity",
+    "image-ar-005-tileset-zenith-sector",
+)
+PLACEHOLDER_PREFIX = "placeholder:"
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+  parser.add_argument(
+      "--placeholders",
+      action="store_true",
+      help="Also index the procedural placeholder tilesets.",
+  )
+  parser.add_argument(
+      "--image",
+      action="append",
+      type=Path,
+      default=[],
+      help="Additional tileset atlas to index (id is the file stem). Repeatable.",
+  )
+  parser.add_argument("--tile-size", type=int, default=DEFAULT_TILE_SIZE, help="Tile size in pixels.")
+  parser.add_argument(
+      "--tolerance",
+      type=int,
+      default=DEFAULT_TOLERANCE,
+      help="Largest per-channel difference (0-255) between premultiplied edge pixels that still matches.",
+  )
+  parser.add_argument(
+      "--out",
+      type=Path,
+      default=INDEX_PATH,
+      help=f"Index JSON path (default {INDEX_PATH.relative_to(ROOT)}).",
+  )
+  parser.add_argument(
+      "--buckets",
+      action="store_true",
+      help="Also write the (side, key) bucket tables, which are otherwise rebuilt from the tiles.",
+  )
+  parser.add_argument(
+      "--query",
+      action="append",
+      default=[],
+      metavar="TILESET#INDEX:SIDE",
+      help="Print exact and tolerant neighbours for a tile side after indexing. Repeatable.",
+  )
+  return parser.parse_args()
+
+
+def collect_sources(args: argparse.Namespace) -> List[Tuple[str, Image.Image, str]]:
+  """``(tileset id, image, source description)`` for every atlas to index."""
+  sources = []
+  for tileset in TILESETS:
+    path = AR005_DIR / f"{tileset}.png"
+    if not path.exists():
+      raise FileNotFoundError(f"Missing AR-005 tileset: {path}")
+    with Image.open(path) as image:
+      sources.append((tileset, image.convert("RGBA"), f"sha256:{file_digest(path)}"))
+
+  for path in args.image:
+    with Image.open(path) as image:
+      sources.append((path.stem, image.convert("RGBA"), f"sha256:{file_digest(path)}"))
+
+  if args.placeholders:
+    import generate_ar_placeholders as placeholders
+
+    for request_id, definition in placeholders.build_asset_definitions().items():
+      if request_id.startswith("image-ar-005-tileset-"):
+        sources.append((
+            f"{PLACEHOLDER_PREFIX}{request_id}",
+            placeholders.render_asset(definition),
+            "generate_ar_placeholders.py",
+        ))
+  return sources
+
+
+def parse_query(query: str) -> Tuple[TileRef, str]:
+  try:
+    tile, side = query.rsplit(":", 1)
+    tileset, index = tile.rsplit("#", 1)
+    ref = TileRef(tileset, int(index))
+  except ValueError:
+    raise SystemExit(f"Malformed --query {query!r}; expected TILESET#INDEX:SIDE") from None
+  if side not in SIDES:
+    raise SystemExit(f"Unknown side {side!r}; expected one of {', '.join(SIDES)}")
+  return ref, side
+
+
+def main() -> None:
+  args = parse_args()
+  index = EdgeSignatureIndex(args.tile_size, args.tolerance)
+
+  started = time.perf_counter()
+  sources = {}
+  for tileset, image, source in collect_sources(args):
+    index.add_tileset(tileset, image)
+    sources[tileset] = source
+  elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+  manifest = index.to_manifest(include_buckets=args.buckets)
+  for tileset, source in sources.items():
+    manifest["tilesets"][tileset]["source"] = source
+    manifest["tilesets"][tileset]["seams"] = index.seam_report(tileset)
+
+  args.out.parent.mkdir(parents=True, exist_ok=True)
+  write_json_atomic(args.out, {"version": 1, "source": "build_tile_edge_index.py", **manifest}, indent=None)
+
+  for tileset in sources:
+    report = manifest["tilesets"][tileset]["seams"]
+    print(
+        f"{tileset}: {report['tiles']} tiles ({report['emptyTiles']} empty skipped), "
+        f"unique edges exact={report['uniqueSignatures']['exact']} "
+        f"coarse={report['uniqueSignatures']['coarse']}, "
+        f"dead-end edges exact={report['deadEndEdges']['exact']} "
+        f"tolerant={report['deadEndEdges']['tolerant']}"
+    )
+  print(f"Indexed {len(index.signatures)} tiles in {elapsed_ms:.1f} ms")
+  print(f"Edge index written to {args.out}")
+
+  for query in args.query:
+    ref, side = parse_query(query)
+    if index.signature(ref, side) is None:
+      print(f"{query}: tile not indexed")
+      continue
+    exact = [tile.to_manifest() for tile in index.neighbours(ref, side)]
+    tolerant = [tile.to_manifest() for tile in index.neighbours(ref, side, tolerant=True)]
+    print(f"{query}: exact {len(exact)} {exact[:8]} | tolerant {len(tolerant)} {tolerant[:8]}")
+
+
+if __name__ == "__main__":
+  main()
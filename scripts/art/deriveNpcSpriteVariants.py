@@ -6,33 +6,111 @@ scales it to the standard 32x48 footprint, and exports transparent PNGs that the
 runtime can consume directly. The script also emits a manifest describing each
 variant so gameplay code can reference faction-specific sprite pools.
 
+With --palette-variants N, every faction additionally gets N recoloured
+variants produced from seeded palette-swap LUTs over its painted variants;
+skin and hair tones keep their painted colours.
+They are numbered after the painted ones. --palette-pack also exports the
+tone-index atlas and LUT texture so the runtime can recolour on the GPU.
+Each run replaces a faction's earlier palette outputs, so the palette
+directory only holds what the manifest lists.
+
+Every finished sheet is checkpointed in a journal next to the manifest; rerun
+with --resume after a failure to skip sheets that already completed.
+
 Usage:
-    python scripts/art/deriveNpcSpriteVariants.py
+    python scripts/art/deriveNpcSpriteVariants.py [--stream [PATH]] [--no-pixel-cache] [--effects] [--resume]
+        [--palette-variants N] [--palette-pack]
 
 Outputs:
     assets/generated/images/ar-004/variants/civilian-01.png
     assets/generated/images/ar-004/variants/guard-01.png
     assets/generated/images/ar-004/variant-manifest.json
+    assets/generated/images/ar-004/variant-manifest.ndjson (with --stream)
+    assets/generated/images/ar-004/variants/effects/civilian-01-glow.png (with --effects)
+    assets/generated/images/ar-004/variants/palette/civilian-06.png (with --palette-variants)
+    assets/generated/images/ar-004/variants/palette/civilian-index.png (with --palette-pack)
+    assets/generated/images/ar-004/variants/palette/civilian-lut.png (with --palette-pack)
 """
 
 from __future__ import annotations
 
-import json
+import argparse
+import hashlib
 from dataclasses import dataclass
 from pathlib import Path
-from random import sample
-from typing import Iterable, List, Sequence, Tuple
+from random import Random
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 from PIL import Image
 
+from lib.atomic_io import write_json_atomic
+from lib.checkpoint_journal import CheckpointJournal
+from lib.manifest_stream import ManifestStream
+from lib.neon_effects import DEFAULT_SETTINGS, EFFECT_KINDS, bake_effects
+from lib.occupancy import OccupancyIndex
+from lib.palette_lut import (
+    LUT_SIZE,
+    PRESERVED_BASE,
+    TONE_LEVELS,
+    ColourRamp,
+    apply_luts,
+    build_luts,
+    index_sprites,
+    pack_index_atlas,
+    pack_lut_texture,
+    sample_specs,
+)
+from lib.pixel_cache import DEFAULT_CACHE_DIR, PixelCache, file_digest
+from lib.reproducible import save_png
+
 ROOT = Path(__file__).resolve().parents[2]
 AR004_DIR = ROOT / "assets" / "generated" / "images" / "ar-004"
 OUTPUT_DIR = AR004_DIR / "variants"
+EFFECTS_DIR = OUTPUT_DIR / "effects"
+PALETTE_DIR = OUTPUT_DIR / "palette"
 MANIFEST_PATH = AR004_DIR / "variant-manifest.json"
+STREAM_PATH = AR004_DIR / "variant-manifest.ndjson"
+JOURNAL_PATH = AR004_DIR / "variant-manifest.journal.ndjson"
+
+SHEETS: Tuple[Tuple[str, str, int], ...] = (
+    ("image-ar-004-npc-civilian-pack.png", "civilian", 5),
+    ("image-ar-004-npc-guard-pack.png", "guard", 3),
+)
 
 TARGET_WIDTH = 32
 TARGET_HEIGHT = 48
 ALPHA_THRESHOLD = 200
+# Fixed so identical sheets always yield identical clusters (and identical output bytes).
+CLUSTER_SEED = 2024
+PALETTE_SEED = 4004
+# Dark-to-light ramps per faction; civilians stay in the street-neon greens, golds
+# and cyans, guards in the enforcement reds, ambers and magentas.
+FACTION_RAMPS: Dict[str, Tuple[ColourRamp, ...]] = {
+    "civilian": (
+        ColourRamp("street-green", ("#04140d", "#1f7a4d", "#58ff9a", "#e4fff0")),
+        ColourRamp("sodium-gold", ("#140d02", "#7a5a14", "#f6c657", "#fff6dc")),
+        ColourRamp("canal-cyan", ("#021018", "#146a87", "#2ddcff", "#e0fbff")),
+        ColourRamp("dusk-violet", ("#0c0818", "#3d2a7a", "#9d7bff", "#efe8ff")),
+    ),
+    "guard": (
+        ColourRamp("alarm-red", ("#180406", "#7a1a2a", "#ff4f6f", "#ffe3e8")),
+        ColourRamp("hazard-amber", ("#180b02", "#7a3f12", "#ff953f", "#fff0e0")),
+        ColourRamp("riot-magenta", ("#16041a", "#7a1f6c", "#ff4fd8", "#ffe6f9")),
+    ),
+}
+
+
+@dataclass
+class BatchContext:
+  """Per-run collaborators shared by every sheet in the batch."""
+
+  stream: ManifestStream
+  pixel_cache: PixelCache
+  journal: CheckpointJournal
+  with_effects: bool = False
+  palette_variants: int = 0
+  palette_pack: bool = False
 
 
 @dataclass
@@ -62,35 +140,49 @@ class BoundingBox:
     )
 
 
-def cluster_pixels(image: Image.Image, k: int) -> List[BoundingBox]:
-  """Cluster high-alpha pixels along the X axis to discover character regions."""
-  width, height = image.size
-  opaque_pixels = [(x, y) for y in range(height) for x in range(width)
-                   if image.getpixel((x, y))[3] > ALPHA_THRESHOLD]
+def seed_centroids(counts: Dict[int, int], k: int, rng: Random) -> List[float]:
+  """k-means++ initialisation over X positions, weighted by pixel count per column."""
+  columns = sorted(counts)
+  centroids = [float(rng.choices(columns, weights=[counts[x] for x in columns])[0])]
+
+  while len(centroids) < k:
+    weights = [counts[x] * min((x - c) ** 2 for c in centroids) for x in columns]
+    if sum(weights) == 0:
+      break
+    centroids.append(float(rng.choices(columns, weights=weights)[0]))
+
+  # Fewer distinct columns than clusters: pad so the caller's cluster check reports it.
+  while len(centroids) < k:
+    centroids.append(centroids[-1])
+  return sorted(centroids)
 
-  if len(opaque_pixels) < k:
-    raise ValueError(f"Not enough opaque pixels to cluster into {k} groups.")
 
-  # Initialise centroids using a stratified sample of X positions.
-  seed_centroids = sorted(sample([x for x, _ in opaque_pixels], k))
-  centroids = seed_centroids[:]
+def cluster_columns(column_counts: np.ndarray, k: int, rng: Random) -> List[Tuple[int, int]]:
+  """1D k-means over the column histogram; returns each cluster's inclusive X span.
+
+  Every pixel in a column shares its X, so clustering the weighted histogram is
+  equivalent to clustering the pixels themselves at O(width) per iteration.
+  """
+  columns = np.flatnonzero(column_counts)
+  weights = column_counts[columns]
+  centroids = seed_centroids(
+      {int(x): int(count) for x, count in zip(columns, weights)}, k, rng)
 
   for _ in range(25):
-    clusters: List[List[Tuple[int, int]]] = [[] for _ in range(k)]
-    for x, y in opaque_pixels:
-      idx = min(range(k), key=lambda i: abs(x - centroids[i]))
-      clusters[idx].append((x, y))
+    assignment = np.abs(columns[:, None] - np.asarray(centroids)[None, :]).argmin(axis=1)
 
     new_centroids: List[float] = []
     converged = True
 
-    for idx, cluster in enumerate(clusters):
-      if not cluster:
+    for idx in range(k):
+      members = assignment == idx
+      total = int(weights[members].sum())
+      if total == 0:
         # Retain the previous centroid to avoid collapsing the cluster.
         new_centroids.append(centroids[idx])
         continue
 
-      average = sum(x for x, _ in cluster) / len(cluster)
+      average = int((columns[members] * weights[members]).sum()) / total
       if abs(average - centroids[idx]) > 0.05:
         converged = False
       new_centroids.append(average)
@@ -99,13 +191,31 @@ def cluster_pixels(image: Image.Image, k: int) -> List[BoundingBox]:
     if converged:
       break
 
+  spans: List[Tuple[int, int]] = []
+  for idx in range(k):
+    members = columns[assignment == idx]
+    if members.size:
+      spans.append((int(members.min()), int(members.max())))
+  return spans
+
+
+def cluster_pixels(image: Image.Image, k: int,
+                   seed: int = CLUSTER_SEED) -> List[BoundingBox]:
+  """Cluster high-alpha pixels along the X axis to discover character regions."""
+  index = OccupancyIndex.from_alpha(image, ALPHA_THRESHOLD, inclusive=False)
+  if index.count(*index.bounds) < k:
+    raise ValueError(f"Not enough opaque pixels to cluster into {k} groups.")
+
+  # Sheets with clean gutters between characters need no clustering at all.
+  spans = index.occupied_runs(0)
+  if len(spans) != k:
+    spans = cluster_columns(index.column_counts(), k, Random(seed))
+
   boxes: List[BoundingBox] = []
-  for cluster in clusters:
-    if not cluster:
-      continue
-    xs = [x for x, _ in cluster]
-    ys = [y for _, y in cluster]
-    boxes.append(BoundingBox(min(xs), min(ys), max(xs), max(ys)))
+  for x0, x1 in spans:
+    tight = index.tighten((x0, 0, x1, index.height - 1))
+    if tight is not None:
+      boxes.append(BoundingBox(*tight))
 
   if len(boxes) != k:
     raise ValueError(f"Expected {k} clusters, found {len(boxes)}.")
@@ -113,8 +223,12 @@ def cluster_pixels(image: Image.Image, k: int) -> List[BoundingBox]:
   return boxes
 
 
-def ensure_output_dir() -> None:
+def ensure_output_dir(with_effects: bool = False, with_palette: bool = False) -> None:
   OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+  if with_effects:
+    EFFECTS_DIR.mkdir(parents=True, exist_ok=True)
+  if with_palette:
+    PALETTE_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def crop_and_scale(image: Image.Image, box: BoundingBox) -> Image.Image:
@@ -139,57 +253,264 @@ def crop_and_scale(image: Image.Image, box: BoundingBox) -> Image.Image:
   return canvas
 
 
-def build_manifest_entry(kind: str, variant_index: int, filename: str) -> dict:
+def project_path(path: Path) -> str:
+  return path.relative_to(ROOT).as_posix()
+
+
+def build_manifest_entry(kind: str, variant_index: int, filename: str,
+                         directory: Path = OUTPUT_DIR) -> dict:
   return {
       "id": f"ar-004::{kind}::{variant_index:02d}",
       "faction": kind,
       "variant": variant_index,
-      "path": f"assets/generated/images/ar-004/variants/{filename}",
+      "path": project_path(directory / filename),
       "width": TARGET_WIDTH,
       "height": TARGET_HEIGHT,
   }
 
 
 def process_sheet(sheet_name: str, kind: str, expected_variants: int,
-                  manifest: List[dict]) -> None:
+                  manifest: List[dict], context: BatchContext) -> None:
   image_path = AR004_DIR / sheet_name
   if not image_path.exists():
     raise FileNotFoundError(f"Missing AR-004 sheet: {image_path}")
 
-  with Image.open(image_path).convert("RGBA") as image:
+  unit = f"sheet:{kind}"
+  unit_key = f"{file_digest(image_path)}:{CLUSTER_SEED}"
+  if context.with_effects:
+    unit_key += f":{DEFAULT_SETTINGS}:{DEFAULT_SETTINGS.padding}"
+  recorded = context.journal.lookup(unit, unit_key)
+  if recorded is not None:
+    for entry in recorded["entries"]:
+      manifest.append(entry)
+      context.stream.emit("asset", resumed=True, **entry)
+    return
+
+  with context.pixel_cache.open_rgba(image_path) as image:
     boxes = cluster_pixels(image, expected_variants)
     boxes.sort(key=lambda b: b.x0)
-
-    for variant_idx, box in enumerate(boxes, start=1):
-      sprite = crop_and_scale(image, box)
-      filename = f"{kind}-{variant_idx:02d}.png"
-      output_path = OUTPUT_DIR / filename
-      sprite.save(output_path)
-
-      manifest.append(build_manifest_entry(kind, variant_idx, filename))
-
-
-def write_manifest(entries: Sequence[dict]) -> None:
+    sprites = [crop_and_scale(image, box) for box in boxes]
+
+  # Bake the whole sheet's effect layers in one batched pass.
+  effects = bake_effects(sprites) if context.with_effects else None
+
+  entries: List[dict] = []
+  outputs: List[Path] = []
+  for variant_idx, sprite in enumerate(sprites, start=1):
+    filename = f"{kind}-{variant_idx:02d}.png"
+    output_path = OUTPUT_DIR / filename
+    save_png(sprite, output_path)
+    outputs.append(output_path)
+
+    entry = build_manifest_entry(kind, variant_idx, filename, OUTPUT_DIR)
+    if effects is not None:
+      entry["effects"] = {}
+      for effect in EFFECT_KINDS:
+        effect_name = f"{kind}-{variant_idx:02d}-{effect}.png"
+        save_png(effects[effect][variant_idx - 1], EFFECTS_DIR / effect_name)
+        outputs.append(EFFECTS_DIR / effect_name)
+        entry["effects"][effect] = project_path(EFFECTS_DIR / effect_name)
+    entries.append(entry)
+    manifest.append(entry)
+    context.stream.emit("asset", **entry)
+
+  context.journal.record(unit, unit_key, outputs, {"entries": entries})
+
+
+def derive_palette_variants(kind: str, manifest: List[dict],
+                            context: BatchContext) -> Optional[dict]:
+  """Recolour the faction's painted variants through seeded LUTs; returns packing info."""
+  base_entries = [entry for entry in manifest if entry["faction"] == kind]
+  base_paths = [ROOT / entry["path"] for entry in base_entries]
+  ramps = FACTION_RAMPS[kind]
+  key_source = "|".join([
+      *(file_digest(path) for path in base_paths),
+      str(PALETTE_SEED),
+      str(context.palette_variants),
+      str(int(context.palette_pack)),
+      f"{TONE_LEVELS}:{PRESERVED_BASE}",
+      repr(ramps),
+  ])
+  unit = f"palette:{kind}"
+  unit_key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+  recorded = context.journal.lookup(unit, unit_key)
+  if recorded is not None:
+    for entry in recorded["entries"]:
+      manifest.append(entry)
+      context.stream.emit("asset", resumed=True, **entry)
+    return recorded["packed"]
+
+  clear_palette_outputs(kind)
+  bases = []
+  for path in base_paths:
+    with Image.open(path) as sprite:
+      bases.append(sprite.convert("RGBA"))
+  indexed, preserved = index_sprites(bases)
+  specs = sample_specs(ramps, context.palette_variants, len(bases), Random(f"{PALETTE_SEED}:{kind}"))
+  luts = build_luts(specs, ramps, preserved)
+  # Every variant of every base sprite in one gather.
+  recoloured = apply_luts(indexed, luts, [spec.base for spec in specs])
+
+  packed = None
+  outputs: List[Path] = []
+  if context.palette_pack:
+    index_path = PALETTE_DIR / f"{kind}-index.png"
+    lut_path = PALETTE_DIR / f"{kind}-lut.png"
+    save_png(pack_index_atlas(indexed), index_path)
+    save_png(pack_lut_texture(luts), lut_path)
+    outputs.extend([index_path, lut_path])
+    packed = {
+        "indexTexture": project_path(index_path),
+        "lutTexture": project_path(lut_path),
+        "lutSize": LUT_SIZE,
+        "rows": len(specs),
+    }
+
+  first_index = len(base_entries) + 1
+  entries: List[dict] = []
+  for row, (spec, pixels) in enumerate(zip(specs, recoloured)):
+    variant_idx = first_index + row
+    filename = f"{kind}-{variant_idx:02d}.png"
+    output_path = PALETTE_DIR / filename
+    save_png(Image.fromarray(pixels, "RGBA"), output_path)
+    outputs.append(output_path)
+
+    entry = build_manifest_entry(kind, variant_idx, filename, PALETTE_DIR)
+    entry["palette"] = {"baseVariant": base_entries[spec.base]["variant"], **spec.to_manifest()}
+    if packed is not None:
+      entry["palette"]["lutRow"] = row
+      entry["palette"]["indexFrame"] = {
+          "x": spec.base * TARGET_WIDTH,
+          "y": 0,
+          "width": TARGET_WIDTH,
+          "height": TARGET_HEIGHT,
+      }
+    entries.append(entry)
+    manifest.append(entry)
+    context.stream.emit("asset", **entry)
+
+  context.journal.record(unit, unit_key, outputs, {"entries": entries, "packed": packed})
+  return packed
+
+
+def clear_palette_outputs(kind: str) -> None:
+  """Delete the faction's palette variants, index atlas and LUT from an earlier run."""
+  if PALETTE_DIR.is_dir():
+    for path in PALETTE_DIR.glob(f"{kind}-*.png"):
+      path.unlink()
+
+
+def write_manifest(entries: Sequence[dict], with_effects: bool = False,
+                   palette: Optional[dict] = None) -> None:
   data = {
       "version": 1,
       "source": "deriveNpcSpriteVariants.py",
       "generated": entries,
   }
-  with MANIFEST_PATH.open("w", encoding="utf-8") as handle:
-    json.dump(data, handle, indent=2)
-    handle.write("\n")
+  if with_effects:
+    data["effects"] = DEFAULT_SETTINGS.to_manifest()
+  if palette is not None:
+    data["palette"] = palette
+  write_json_atomic(MANIFEST_PATH, data)
+
+
+def palette_manifest(packed: Dict[str, Optional[dict]]) -> dict:
+  return {
+      "seed": PALETTE_SEED,
+      "toneLevels": TONE_LEVELS,
+      "preservedBase": PRESERVED_BASE,
+      "ramps": {
+          kind: [ramp.to_manifest() for ramp in FACTION_RAMPS[kind]]
+          for kind in packed
+      },
+      "packed": {kind: info for kind, info in packed.items() if info is not None},
+  }
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+  parser.add_argument(
+      "--stream",
+      nargs="?",
+      const=STREAM_PATH,
+      type=Path,
+      help="Emit one NDJSON record per variant as it is written "
+      f"(default path: {STREAM_PATH.relative_to(ROOT)}).",
+  )
+  parser.add_argument(
+      "--no-pixel-cache",
+      action="store_true",
+      help="Decode source sheets from scratch instead of mapping cached pixels "
+      f"from {DEFAULT_CACHE_DIR.relative_to(ROOT)}.",
+  )
+  parser.add_argument(
+      "--effects",
+      action="store_true",
+      help="Also bake glow, outline and silhouette layers for every variant.",
+  )
+  parser.add_argument(
+      "--palette-variants",
+      type=int,
+      default=0,
+      metavar="N",
+      help="Also derive N seeded palette-swap variants per faction.",
+  )
+  parser.add_argument(
+      "--palette-pack",
+      action="store_true",
+      help="With --palette-variants, also export tone-index atlases and LUT textures "
+      "for GPU recolouring.",
+  )
+  parser.add_argument(
+      "--resume",
+      action="store_true",
+      help="Skip sheets already checkpointed in "
+      f"{JOURNAL_PATH.relative_to(ROOT)} by an interrupted run.",
+  )
+  return parser.parse_args()
 
 
 def main() -> None:
-  ensure_output_dir()
+  args = parse_args()
+  if args.palette_variants < 0:
+    raise SystemExit("--palette-variants must not be negative")
+  if args.palette_pack and args.palette_variants == 0:
+    raise SystemExit("--palette-pack requires --palette-variants")
+  with_palette = args.palette_variants > 0
+  ensure_output_dir(args.effects, with_palette)
   manifest_entries: List[dict] = []
+  pixel_cache = PixelCache(None if args.no_pixel_cache else DEFAULT_CACHE_DIR)
+
+  journal = CheckpointJournal(JOURNAL_PATH, ROOT, resume=args.resume)
+
+  with ManifestStream(args.stream, "deriveNpcSpriteVariants.py") as stream, journal:
+    context = BatchContext(stream, pixel_cache, journal, args.effects,
+                           args.palette_variants, args.palette_pack)
+    for sheet_name, kind, expected_variants in SHEETS:
+      process_sheet(sheet_name, kind, expected_variants, manifest_entries, context)
+
+    palette = None
+    if with_palette:
+      packed = {
+          kind: derive_palette_variants(kind, manifest_entries, context)
+          for _, kind, _ in SHEETS
+      }
+      palette = palette_manifest(packed)
+    else:
+      for _, kind, _ in SHEETS:
+        clear_palette_outputs(kind)
+
+    write_manifest(manifest_entries, args.effects, palette)
+    stream.finish(MANIFEST_PATH, ROOT)
+  journal.finish()
+
+  if journal.resumed_units:
+    print(f"Resumed {journal.resumed_units} sheet(s) from {JOURNAL_PATH}")
 
-  process_sheet("image-ar-004-npc-civilian-pack.png", "civilian", 5, manifest_entries)
-  process_sheet("image-ar-004-npc-guard-pack.png", "guard", 3, manifest_entries)
-
-  write_manifest(manifest_entries)
   print(f"Generated {len(manifest_entries)} NPC variants into {OUTPUT_DIR}")
   print(f"Manifest written to {MANIFEST_PATH}")
+  if stream.enabled:
+    print(f"Streamed records written to {stream.path}")
 
 
 if __name__ == "__main__":
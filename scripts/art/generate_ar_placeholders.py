@@ -5,19 +5,94 @@ Generate neon-noir placeholder assets for AR-001 through AR-005 requests.
 These placeholders unblock UI wiring and gameplay iteration until bespoke art
 arrives. All assets are generated procedurally using Pillow so licensing stays
 internal to the project.
+
+Rounded-rectangle UI elements are additionally exported as compact nine-slice
+textures with their insets recorded in ``ui-nine-slice.json``, so the UI can
+scale buttons and panels from a tiny texture instead of full-size bitmaps.
+
+Pass ``--effects`` to also bake glow/outline/silhouette layers for the
+transparent AR-002 icons into ``assets/generated/ar-placeholders/effects/``,
+and ``--sdf`` to export single-channel signed distance fields (one per flat
+colour layer of each icon, each with its own tint) and the evidence glyphs
+into ``assets/generated/ar-placeholders/sdf/``.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
+import argparse
+import math
+from collections import defaultdict
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Callable, Dict, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
+from lib.atomic_io import write_json_atomic
+from lib.distance_field import DEFAULT_SPREAD, alpha_mask, colour_mask, encode_sdf, sdf_manifest_params
+from lib.neon_effects import DEFAULT_SETTINGS, EFFECT_KINDS, bake_effects
+from lib.reproducible import save_png
+from lib.stamps import StampCache, compose_grid
+
 
 OUTPUT_DIR = Path("assets/generated/ar-placeholders")
+NINE_SLICE_MANIFEST_PATH = OUTPUT_DIR / "ui-nine-slice.json"
+BUTTON_SLICE_ATLAS_ID = "image-ar-001-ui-button-slices"
+BOARD_TILE_ID = "image-ar-001-deduction-board-tile"
+EFFECTS_DIR = OUTPUT_DIR / "effects"
+EFFECTS_MANIFEST_PATH = EFFECTS_DIR / "effects-manifest.json"
+# Only transparent sprites benefit from baked halos; opaque sheets would glow as solid blocks.
+EFFECT_TARGETS = (
+    "image-ar-002-generic-marker",
+    "image-ar-002-fingerprint",
+    "image-ar-002-document",
+    "image-ar-002-neural-extractor",
+    "image-ar-002-blood-spatter",
+)
+SDF_DIR = OUTPUT_DIR / "sdf"
+SDF_MANIFEST_PATH = SDF_DIR / "sdf-manifest.json"
+# Icons exported as distance fields: one (layer, colour) per flat colour the
+# generator draws, in draw order. The colour selects the pixels and is the
+# tint the runtime applies, so outlines and interior strokes keep their own field.
+SDF_TARGETS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "image-ar-002-generic-marker": (("body", "#132238"), ("head", "#0b162f"), ("outline", "#2ddcff")),
+    "image-ar-002-fingerprint": (("ridges", "#2ddcff"), ("arc", "#ff4fd8")),
+    "image-ar-002-document": (("page", "#141f33"), ("ink", "#58ff9a"), ("seal", "#2ddcff")),
+    "image-ar-002-neural-extractor": (("body", "#1a2744"), ("outline", "#2ddcff"), ("probe", "#ff4fd8")),
+}
+EVIDENCE_ICON_SET_ID = "image-ar-001-evidence-icon-set"
 DEFAULT_BG = "#0b0f1e"
 PRIMARY_COLOURS = ["#2ddcff", "#ff4fd8", "#f6c657", "#6ce1b8"]
+EVIDENCE_ICONS = (
+    ("physical", PRIMARY_COLOURS[0]),
+    ("digital", PRIMARY_COLOURS[1]),
+    ("testimonial", PRIMARY_COLOURS[2]),
+    ("forensic", PRIMARY_COLOURS[3]),
+)
+
+
+@dataclass(frozen=True)
+class RoundedRectStyle:
+    fill: str
+    outline: str
+    outline_width: int
+    radius: int
+
+
+UI_BUTTONS = (
+    ("play", "#2ddcff"),
+    ("pause", "#58ff9a"),
+    ("settings", "#2c9bff"),
+    ("confirm", "#f6c657"),
+    ("cancel", "#ff4f6f"),
+)
+BOARD_GRID_SPACING = 64
+# Stretchable centre of a compact nine-slice texture, in pixels.
+NINE_SLICE_CENTRE = 2
+NINE_SLICE_PADDING = 2
+# Unique grid cells rendered once per run and blitted wherever they repeat.
+STAMP_CACHE = StampCache()
 
 
 @dataclass(frozen=True)
@@ -31,6 +106,7 @@ def ensure_output_dir() -> None:
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
+@lru_cache(maxsize=None)
 def load_font(point_size: int = 12) -> ImageFont.ImageFont:
     try:
         return ImageFont.truetype("DejaVuSans.ttf", point_size)
@@ -79,14 +155,19 @@ def draw_node_graph(canvas: Image.Image, draw: ImageDraw.ImageDraw) -> None:
         )
 
 
-def generate_deduction_board(canvas: Image.Image, draw: ImageDraw.ImageDraw) -> None:
+def draw_board_grid(canvas: Image.Image, draw: ImageDraw.ImageDraw) -> None:
     draw.rectangle([(0, 0), canvas.size], fill=DEFAULT_BG)
     width, height = canvas.size
-    grid_spacing = 64
+    grid_spacing = BOARD_GRID_SPACING
     for offset in range(0, width + grid_spacing, grid_spacing):
         draw.line([(offset, 0), (offset, height)], fill="#122034", width=2)
     for offset in range(0, height + grid_spacing, grid_spacing):
         draw.line([(0, offset), (width, offset)], fill="#122034", width=2)
+
+
+def generate_deduction_board(canvas: Image.Image, draw: ImageDraw.ImageDraw) -> None:
+    draw_board_grid(canvas, draw)
+    width, height = canvas.size
     draw_node_graph(canvas, draw)
     font = load_font(32)
     draw.text(
@@ -151,16 +232,18 @@ def generate_clue_nodes(canvas: Image.Image, draw: ImageDraw.ImageDraw) -> None:
         )
 
 
-def generate_evidence_icons(canvas: Image.Image, draw: ImageDraw.ImageDraw) -> None:
-    icons = [
-        ("physical", PRIMARY_COLOURS[0]),
-        ("digital", PRIMARY_COLOURS[1]),
-        ("testimonial", PRIMARY_COLOURS[2]),
-        ("forensic", PRIMARY_COLOURS[3]),
+def evidence_icon_polygon(x_start: int, cell_width: int, height: int) -> List[Tuple[float, float]]:
+    return [
+        (x_start + cell_width * 0.2, height * 0.75),
+        (x_start + cell_width * 0.5, height * 0.25),
+        (x_start + cell_width * 0.8, height * 0.75),
     ]
+
+
+def generate_evidence_icons(canvas: Image.Image, draw: ImageDraw.ImageDraw) -> None:
     width, height = canvas.size
-    cell_width = width // len(icons)
-    for idx, (label, colour) in enumerate(icons):
+    cell_width = width // len(EVIDENCE_ICONS)
+    for idx, (label, colour) in enumerate(EVIDENCE_ICONS):
         x_start = idx * cell_width
         draw.rectangle(
             [(x_start, 0), (x_start + cell_width, height)],
@@ -169,11 +252,7 @@ def generate_evidence_icons(canvas: Image.Image, draw: ImageDraw.ImageDraw) -> N
             width=1,
         )
         draw.polygon(
-            [
-                (x_start + cell_width * 0.2, height * 0.75),
-                (x_start + cell_width * 0.5, height * 0.25),
-                (x_start + cell_width * 0.8, height * 0.75),
-            ],
+            evidence_icon_polygon(x_start, cell_width, height),
             outline=colour,
             fill=colour,
         )
@@ -185,35 +264,48 @@ def generate_evidence_icons(canvas: Image.Image, draw: ImageDraw.ImageDraw) -> N
         )
 
 
+def button_styles(colour: str) -> Dict[str, RoundedRectStyle]:
+    return {
+        "normal": RoundedRectStyle(fill=colour, outline="#081020", outline_width=3, radius=12),
+        "pressed": RoundedRectStyle(fill="#0b162f", outline=colour, outline_width=2, radius=12),
+    }
+
+
+def button_rects(canvas_size: Tuple[int, int], idx: int) -> Dict[str, Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """Inclusive corner coordinates of the normal/pressed button at column ``idx``."""
+    width, height = canvas_size
+    button_width = width // len(UI_BUTTONS)
+    normal_height = height // 2
+    x_start = idx * button_width
+    return {
+        "normal": ((x_start + 6, 6), (x_start + button_width - 6, normal_height - 4)),
+        "pressed": ((x_start + 6, normal_height + 4), (x_start + button_width - 6, height - 6)),
+    }
+
+
+def draw_rounded_rect(
+    draw: ImageDraw.ImageDraw,
+    rect: Tuple[Tuple[int, int], Tuple[int, int]],
+    style: RoundedRectStyle,
+) -> None:
+    draw.rounded_rectangle(
+        list(rect),
+        radius=style.radius,
+        fill=style.fill,
+        outline=style.outline,
+        width=style.outline_width,
+    )
+
+
 def generate_button_pack(canvas: Image.Image, draw: ImageDraw.ImageDraw) -> None:
-    buttons = [
-        ("play", "#2ddcff"),
-        ("pause", "#58ff9a"),
-        ("settings", "#2c9bff"),
-        ("confirm", "#f6c657"),
-        ("cancel", "#ff4f6f"),
-    ]
-    button_width = canvas.width // len(buttons)
+    button_width = canvas.width // len(UI_BUTTONS)
     normal_height = canvas.height // 2
-    for idx, (label, colour) in enumerate(buttons):
+    for idx, (label, colour) in enumerate(UI_BUTTONS):
         x_start = idx * button_width
-        draw.rounded_rectangle(
-            [(x_start + 6, 6), (x_start + button_width - 6, normal_height - 4)],
-            radius=12,
-            fill=colour,
-            outline="#081020",
-            width=3,
-        )
-        draw.rounded_rectangle(
-            [
-                (x_start + 6, normal_height + 4),
-                (x_start + button_width - 6, canvas.height - 6),
-            ],
-            radius=12,
-            fill="#0b162f",
-            outline=colour,
-            width=2,
-        )
+        styles = button_styles(colour)
+        rects = button_rects(canvas.size, idx)
+        draw_rounded_rect(draw, rects["normal"], styles["normal"])
+        draw_rounded_rect(draw, rects["pressed"], styles["pressed"])
         draw.text(
             (x_start + 12, 12),
             label,
@@ -280,71 +372,115 @@ def generate_blood_spatter(canvas: Image.Image, draw: ImageDraw.ImageDraw) -> No
     draw.ellipse([(20, 6), (26, 12)], fill="#d41d4d")
 
 
+def draw_player_cell(draw: ImageDraw.ImageDraw, cell_size: Tuple[int, int], direction: str) -> None:
+    cell_width, cell_height = cell_size
+    draw.rectangle(
+        [(1, 1), (cell_width - 2, cell_height - 2)],
+        outline="#0e1624",
+        fill="#0e1529",
+    )
+    draw.ellipse(
+        [
+            (cell_width // 2 - 6, 6),
+            (cell_width // 2 + 6, 18),
+        ],
+        fill="#f1d0a8",
+    )
+    draw.rectangle(
+        [
+            (cell_width // 2 - 10, 18),
+            (cell_width // 2 + 10, cell_height - 4),
+        ],
+        fill="#1a2a44",
+    )
+    draw.text(
+        (4, cell_height - 14),
+        direction,
+        font=load_font(10),
+        fill="#7f9dd6",
+    )
+
+
 def generate_player_sprite(canvas: Image.Image, draw: ImageDraw.ImageDraw) -> None:
-    draw.rectangle([(0, 0), canvas.size], fill="#141f33")
-    cell_width = canvas.width // 4
-    cell_height = canvas.height // 3
+    background = "#141f33"
+    draw.rectangle([(0, 0), canvas.size], fill=background)
+    cell_size = (canvas.width // 4, canvas.height // 3)
     directions = ["N", "E", "S", "W"]
-    for col, direction in enumerate(directions):
-        for row in range(3):
-            x_start = col * cell_width
-            y_start = row * cell_height
-            draw.rectangle(
-                [(x_start + 1, y_start + 1), (x_start + cell_width - 2, y_start + cell_height - 2)],
-                outline="#0e1624",
-                fill="#0e1529",
-            )
-            draw.ellipse(
-                [
-                    (x_start + cell_width // 2 - 6, y_start + 6),
-                    (x_start + cell_width // 2 + 6, y_start + 18),
-                ],
-                fill="#f1d0a8",
-            )
-            draw.rectangle(
-                [
-                    (x_start + cell_width // 2 - 10, y_start + 18),
-                    (x_start + cell_width // 2 + 10, y_start + cell_height - 4),
-                ],
-                fill="#1a2a44",
-            )
-            draw.text(
-                (x_start + 4, y_start + cell_height - 14),
-                direction,
-                font=load_font(10),
-                fill="#7f9dd6",
-            )
+    # Every row repeats the same four direction cells; render each once.
+    stamps = [
+        STAMP_CACHE.stamp(
+            ("player-cell", direction),
+            cell_size,
+            lambda _, cell_draw, direction=direction: draw_player_cell(cell_draw, cell_size, direction),
+            background,
+        )
+        for direction in directions
+    ]
+    indices = np.tile(np.arange(len(directions)), (3, 1))
+    compose_grid(canvas, stamps, indices)
+
+
+def draw_npc_cell(draw: ImageDraw.ImageDraw, cell_size: Tuple[int, int], visor_colour: str) -> None:
+    cell_width, cell_height = cell_size
+    draw.rectangle(
+        [
+            (4, 4),
+            (cell_width - 4, cell_height - 4),
+        ],
+        fill="#1a243b",
+        outline="#0d1324",
+        width=1,
+    )
+    draw.rectangle(
+        [
+            (8, 8),
+            (cell_width - 8, 18),
+        ],
+        fill=visor_colour,
+    )
+    draw.rectangle(
+        [
+            (10, 20),
+            (cell_width - 10, 28),
+        ],
+        fill="#101c30",
+    )
 
 
 def generate_npc_pack(canvas: Image.Image, draw: ImageDraw.ImageDraw, palette: Tuple[str, str, str]) -> None:
-    draw.rectangle([(0, 0), canvas.size], fill="#111a2d")
+    background = "#111a2d"
+    draw.rectangle([(0, 0), canvas.size], fill=background)
     columns = 3
-    cell_width = canvas.width // columns
-    for idx in range(columns):
-        x_start = idx * cell_width
-        visor_colour = palette[idx % len(palette)]
-        draw.rectangle(
-            [
-                (x_start + 4, 4),
-                (x_start + cell_width - 4, canvas.height - 4),
-            ],
-            fill="#1a243b",
-            outline="#0d1324",
-            width=1,
-        )
-        draw.rectangle(
-            [
-                (x_start + 8, 8),
-                (x_start + cell_width - 8, 18),
-            ],
-            fill=visor_colour,
+    cell_size = (canvas.width // columns, canvas.height)
+    visor_colours = [palette[idx % len(palette)] for idx in range(columns)]
+    stamps = [
+        STAMP_CACHE.stamp(
+            ("npc-cell", visor_colour),
+            cell_size,
+            lambda _, cell_draw, visor_colour=visor_colour: draw_npc_cell(cell_draw, cell_size, visor_colour),
+            background,
         )
-        draw.rectangle(
+        for visor_colour in visor_colours
+    ]
+    compose_grid(canvas, stamps, np.arange(columns)[np.newaxis, :])
+
+
+def draw_tile(draw: ImageDraw.ImageDraw, tile_size: int, colour: str, scanline: bool) -> None:
+    draw.rectangle(
+        [
+            (0, 0),
+            (tile_size - 1, tile_size - 1),
+        ],
+        fill=colour,
+        outline="#070b16",
+    )
+    if scanline:
+        draw.line(
             [
-                (x_start + 10, 20),
-                (x_start + cell_width - 10, 28),
+                (0, tile_size - 3),
+                (tile_size - 1, tile_size - 3),
             ],
-            fill="#101c30",
+            fill="#0d1324",
         )
 
 
@@ -352,27 +488,24 @@ def generate_tileset(canvas: Image.Image, draw: ImageDraw.ImageDraw, palette: Tu
     tile_size = 16
     cols = canvas.width // tile_size
     rows = canvas.height // tile_size
-    for row in range(rows):
-        for col in range(cols):
-            x_start = col * tile_size
-            y_start = row * tile_size
-            colour = palette[(row + col) % len(palette)]
-            draw.rectangle(
-                [
-                    (x_start, y_start),
-                    (x_start + tile_size - 1, y_start + tile_size - 1),
-                ],
-                fill=colour,
-                outline="#070b16",
+    # A tile depends only on (row + col), through its palette colour and scanline
+    # flag, so the whole sheet cycles through lcm(len(palette), 3) distinct tiles.
+    period = math.lcm(len(palette), 3)
+    stamps = []
+    for phase in range(period):
+        colour = palette[phase % len(palette)]
+        scanline = phase % 3 == 0
+        stamps.append(
+            STAMP_CACHE.stamp(
+                ("tile", colour, scanline),
+                (tile_size, tile_size),
+                lambda _, tile_draw, colour=colour, scanline=scanline: draw_tile(
+                    tile_draw, tile_size, colour, scanline
+                ),
             )
-            if (row + col) % 3 == 0:
-                draw.line(
-                    [
-                        (x_start, y_start + tile_size - 3),
-                        (x_start + tile_size - 1, y_start + tile_size - 3),
-                    ],
-                    fill="#0d1324",
-                )
+        )
+    phases = np.add.outer(np.arange(rows), np.arange(cols)) % period
+    compose_grid(canvas, stamps, phases)
 
 
 def build_asset_definitions() -> Dict[str, AssetDefinition]:
@@ -460,22 +593,233 @@ def build_asset_definitions() -> Dict[str, AssetDefinition]:
     }
 
 
-def save_asset(definition: AssetDefinition) -> Path:
+def render_asset(definition: AssetDefinition) -> Image.Image:
     width, height = definition.size
     canvas = Image.new("RGBA", (width, height), color=(0, 0, 0, 0))
     draw = ImageDraw.Draw(canvas)
     definition.generator(canvas, draw)
+    return canvas
+
+
+def save_asset(definition: AssetDefinition, canvas: Image.Image | None = None) -> Path:
+    if canvas is None:
+        canvas = render_asset(definition)
     output_path = OUTPUT_DIR / f"{definition.request_id}.png"
-    canvas.save(output_path)
+    save_png(canvas, output_path)
     return output_path
 
 
+def render_nine_slice(style: RoundedRectStyle, source_size: Tuple[int, int]) -> Tuple[Image.Image, int]:
+    """Render the smallest texture that keeps the rounded corners intact."""
+    # Short buttons cannot fit the nominal radius, so clamp to what actually fits the source.
+    style = replace(style, radius=min(style.radius, (min(source_size) - 1) // 2))
+    inset = max(style.radius, style.outline_width)
+    size = inset * 2 + NINE_SLICE_CENTRE
+    texture = Image.new("RGBA", (size, size), color=(0, 0, 0, 0))
+    draw_rounded_rect(ImageDraw.Draw(texture), ((0, 0), (size - 1, size - 1)), style)
+    return texture, inset
+
+
+def save_nine_slices(definitions: Dict[str, AssetDefinition]) -> List[Path]:
+    """Export compact button slices plus a repeating board tile, described in one manifest."""
+    button_pack = definitions["image-ar-001-ui-button-pack"]
+    states = ("normal", "pressed")
+    slices: List[Tuple[str, str, Image.Image, int, Tuple[int, int]]] = []
+    for idx, (label, colour) in enumerate(UI_BUTTONS):
+        styles = button_styles(colour)
+        rects = button_rects(button_pack.size, idx)
+        for state in states:
+            (x0, y0), (x1, y1) = rects[state]
+            source_size = (x1 - x0 + 1, y1 - y0 + 1)
+            texture, inset = render_nine_slice(styles[state], source_size)
+            slices.append((label, state, texture, inset, source_size))
+
+    cell = max(texture.width for _, _, texture, _, _ in slices) + NINE_SLICE_PADDING
+    atlas = Image.new("RGBA", (cell * len(UI_BUTTONS), cell * len(states)), color=(0, 0, 0, 0))
+    atlas_path = OUTPUT_DIR / f"{BUTTON_SLICE_ATLAS_ID}.png"
+    entries = []
+    for index, (label, state, texture, inset, source_size) in enumerate(slices):
+        x_pos = (index // len(states)) * cell
+        y_pos = states.index(state) * cell
+        atlas.paste(texture, (x_pos, y_pos))
+        entries.append({
+            "id": f"{button_pack.request_id}::{label}::{state}",
+            "source": button_pack.request_id,
+            "texture": atlas_path.as_posix(),
+            "frame": {"x": x_pos, "y": y_pos, "width": texture.width, "height": texture.height},
+            "insets": {"left": inset, "top": inset, "right": inset, "bottom": inset},
+            "mode": "nine-slice",
+            "sourceSize": {"width": source_size[0], "height": source_size[1]},
+        })
+    save_png(atlas, atlas_path)
+
+    # The board background is flat fill plus a regular grid, so a single grid cell tiles it.
+    board = definitions["image-ar-001-deduction-board-bg"]
+    board_canvas = Image.new("RGBA", board.size, color=(0, 0, 0, 0))
+    draw_board_grid(board_canvas, ImageDraw.Draw(board_canvas))
+    spacing = BOARD_GRID_SPACING
+    tile = board_canvas.crop((spacing, spacing, spacing * 2, spacing * 2))
+    tile_path = OUTPUT_DIR / f"{BOARD_TILE_ID}.png"
+    save_png(tile, tile_path)
+    entries.append({
+        "id": f"{board.request_id}::grid",
+        "source": board.request_id,
+        "texture": tile_path.as_posix(),
+        "frame": {"x": 0, "y": 0, "width": spacing, "height": spacing},
+        "insets": {"left": 0, "top": 0, "right": 0, "bottom": 0},
+        "mode": "tile",
+        "sourceSize": {"width": board.size[0], "height": board.size[1]},
+    })
+
+    manifest = {
+        "version": 1,
+        "source": "generate_ar_placeholders.py",
+        "note": "Labels, node graph and captions are drawn by the UI on top of these slices.",
+        "slices": entries,
+    }
+    write_json_atomic(NINE_SLICE_MANIFEST_PATH, manifest)
+    return [atlas_path, tile_path, NINE_SLICE_MANIFEST_PATH]
+
+
+def save_effects(canvases: Dict[str, Image.Image]) -> List[Path]:
+    """Bake effect layers for every target, batching same-sized canvases together."""
+    EFFECTS_DIR.mkdir(parents=True, exist_ok=True)
+    batches: Dict[Tuple[int, int], List[str]] = defaultdict(list)
+    for request_id in EFFECT_TARGETS:
+        batches[canvases[request_id].size].append(request_id)
+
+    entries: Dict[str, Dict[str, str]] = {}
+    written: List[Path] = []
+    for request_ids in batches.values():
+        effects = bake_effects([canvases[request_id] for request_id in request_ids])
+        for index, request_id in enumerate(request_ids):
+            entries[request_id] = {}
+            for effect in EFFECT_KINDS:
+                path = EFFECTS_DIR / f"{request_id}-{effect}.png"
+                save_png(effects[effect][index], path)
+                entries[request_id][effect] = path.as_posix()
+                written.append(path)
+
+    manifest = {
+        "version": 1,
+        "source": "generate_ar_placeholders.py",
+        "settings": DEFAULT_SETTINGS.to_manifest(),
+        "effects": {request_id: entries[request_id] for request_id in EFFECT_TARGETS},
+    }
+    write_json_atomic(EFFECTS_MANIFEST_PATH, manifest)
+    written.append(EFFECTS_MANIFEST_PATH)
+    return written
+
+
+def render_evidence_glyph_mask(size: Tuple[int, int]) -> Image.Image:
+    """Glyph-only coverage of the evidence set; the cell backgrounds are opaque."""
+    mask = Image.new("L", size, color=0)
+    draw = ImageDraw.Draw(mask)
+    cell_width = size[0] // len(EVIDENCE_ICONS)
+    for idx in range(len(EVIDENCE_ICONS)):
+        polygon = evidence_icon_polygon(idx * cell_width, cell_width, size[1])
+        draw.polygon(polygon, outline=255, fill=255)
+    return mask
+
+
+def icon_sdf_layers(
+    request_id: str,
+    canvas: Image.Image,
+    spread: float = DEFAULT_SPREAD,
+) -> List[Tuple[str, str, Image.Image]]:
+    """``(layer, tint, field)`` per flat colour of an SDF target, in draw order."""
+    covered = np.zeros(canvas.size[::-1], dtype=bool)
+    layers = []
+    for layer, colour in SDF_TARGETS[request_id]:
+        mask = colour_mask(canvas, colour)
+        if not mask.any():
+            raise ValueError(f"{request_id}: no pixels drawn in {colour} for SDF layer '{layer}'")
+        covered |= mask
+        layers.append((layer, colour, encode_sdf(mask, spread)))
+    if not np.array_equal(covered, alpha_mask(canvas)):
+        raise ValueError(f"{request_id}: SDF layers do not cover every opaque pixel; update SDF_TARGETS")
+    return layers
+
+
+def save_sdfs(canvases: Dict[str, Image.Image], spread: float = DEFAULT_SPREAD) -> List[Path]:
+    """Export distance fields for the AR-002 icons and evidence glyphs plus a manifest."""
+    SDF_DIR.mkdir(parents=True, exist_ok=True)
+    entries = []
+    written: List[Path] = []
+
+    for request_id in SDF_TARGETS:
+        canvas = canvases[request_id]
+        layers = []
+        for layer, tint, field in icon_sdf_layers(request_id, canvas, spread):
+            path = SDF_DIR / f"{request_id}-{layer}-sdf.png"
+            save_png(field, path)
+            written.append(path)
+            layers.append({"name": layer, "texture": path.as_posix(), "tint": tint})
+        entries.append({
+            "id": request_id,
+            **sdf_manifest_params(spread, canvas.size),
+            "layers": layers,
+        })
+
+    evidence_size = canvases[EVIDENCE_ICON_SET_ID].size
+    cell_width = evidence_size[0] // len(EVIDENCE_ICONS)
+    path = SDF_DIR / f"{EVIDENCE_ICON_SET_ID}-sdf.png"
+    save_png(encode_sdf(alpha_mask(render_evidence_glyph_mask(evidence_size)), spread), path)
+    written.append(path)
+    entries.append({
+        "id": EVIDENCE_ICON_SET_ID,
+        "texture": path.as_posix(),
+        **sdf_manifest_params(spread, evidence_size),
+        "cells": [
+            {
+                "label": label,
+                "tint": colour,
+                "frame": {"x": idx * cell_width, "y": 0, "width": cell_width, "height": evidence_size[1]},
+            }
+            for idx, (label, colour) in enumerate(EVIDENCE_ICONS)
+        ],
+    })
+
+    manifest = {
+        "version": 1,
+        "source": "generate_ar_placeholders.py",
+        "fields": entries,
+    }
+    write_json_atomic(SDF_MANIFEST_PATH, manifest)
+    written.append(SDF_MANIFEST_PATH)
+    return written
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate neon-noir placeholder assets for AR-001 through AR-005.")
+    parser.add_argument(
+        "--effects",
+        action="store_true",
+        help="Also bake glow, outline and silhouette layers for the transparent AR-002 icons.",
+    )
+    parser.add_argument(
+        "--sdf",
+        action="store_true",
+        help="Also export signed distance fields for the AR-002 icons and evidence glyphs.",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
     ensure_output_dir()
     definitions = build_asset_definitions()
+    canvases: Dict[str, Image.Image] = {}
     generated_paths = []
-    for definition in definitions.values():
-        generated_paths.append(save_asset(definition))
+    for request_id, definition in definitions.items():
+        canvases[request_id] = render_asset(definition)
+        generated_paths.append(save_asset(definition, canvases[request_id]))
+    generated_paths.extend(save_nine_slices(definitions))
+
+    if args.effects:
+        generated_paths.extend(save_effects(canvases))
+    if args.sdf:
+        generated_paths.extend(save_sdfs(canvases))
 
     print("Generated placeholder assets:")
     for path in generated_paths:
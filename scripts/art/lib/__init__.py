@@ -0,0 +1,5 @@
+"""Shared helpers for the Python art pipeline scripts in ``scripts/art``.
+
+The scripts and these helpers need Pillow and NumPy; both are listed in
+``scripts/art/requirements.txt``.
+"""
@@ -0,0 +1,42 @@
+"""
+Temp-file-and-rename helpers so an interrupted run never leaves a torn output.
+
+Readers either see the previous complete file or the new complete file, never
+a partially written one.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+@contextmanager
+def atomic_output(path: Path) -> Iterator[Path]:
+  """Yield a sibling temp path; it replaces ``path`` only if the block succeeds."""
+  temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+  try:
+    yield temp_path
+    os.replace(temp_path, path)
+  finally:
+    if temp_path.exists():
+      temp_path.unlink()
+
+
+def write_bytes_atomic(path: Path, payload: bytes) -> None:
+  with atomic_output(path) as temp_path:
+    with temp_path.open("wb") as handle:
+      handle.write(payload)
+      handle.flush()
+      os.fsync(handle.fileno())
+
+
+def write_json_atomic(path: Path, data: object, indent: Optional[int] = 2,
+                      trailing_newline: bool = True) -> None:
+  text = json.dumps(data, indent=indent)
+  if trailing_newline:
+    text += "\n"
+  write_bytes_atomic(path, text.encode("utf-8"))
@@ -0,0 +1,111 @@
+"""
+Checkpoint journal for resumable art batches.
+
+Every completed unit of work (a sheet, a set of detected frames, an atlas) is
+appended to an NDJSON journal as soon as its outputs are safely on disk. A
+later run started with ``resume=True`` skips any unit whose recorded key still
+matches and whose outputs still exist, and reuses the data recorded for it.
+
+Keys should capture everything the unit depends on, typically source digests
+plus the options that shape the output. A changed input therefore only
+invalidates the units that consumed it.
+
+Journal records:
+    {"event": "unit", "unit": "<id>", "key": "<key>", "outputs": [...], "data": {...}}
+
+The journal is deleted once the consolidated manifest has been written.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import IO, Dict, Iterable, Optional
+
+
+class CheckpointJournal:
+  """Append-only record of completed units, keyed so stale checkpoints are ignored."""
+
+  def __init__(self, path: Path, root: Path, resume: bool = False) -> None:
+    self.path = path
+    self.root = root
+    self.resume = resume
+    self.resumed_units = 0
+    self._completed: Dict[str, dict] = self._load() if resume else {}
+    self._handle: Optional[IO[str]] = None
+
+  def _load(self) -> Dict[str, dict]:
+    completed: Dict[str, dict] = {}
+    if not self.path.exists():
+      return completed
+    with self.path.open("r", encoding="utf-8") as handle:
+      for line in handle:
+        try:
+          record = json.loads(line)
+        except ValueError:
+          # A crash mid-append can truncate the final line; everything before it is valid.
+          break
+        if record.get("event") == "unit":
+          completed[record["unit"]] = record
+    return completed
+
+  def open(self) -> "CheckpointJournal":
+    self.path.parent.mkdir(parents=True, exist_ok=True)
+    self._handle = self.path.open("w", encoding="utf-8")
+    # Carry still-valid checkpoints forward so a second interruption loses nothing.
+    for record in self._completed.values():
+      self._write(record)
+    return self
+
+  def lookup(self, unit: str, key: str) -> Optional[dict]:
+    """Return the recorded data for ``unit`` if it can be skipped, else ``None``."""
+    record = self._completed.get(unit)
+    if record is None or record.get("key") != key:
+      return None
+    if not all((self.root / output).exists() for output in record.get("outputs", [])):
+      return None
+    self.resumed_units += 1
+    return record.get("data", {})
+
+  def record(self, unit: str, key: str, outputs: Iterable[Path],
+             data: Optional[dict] = None) -> None:
+    """Checkpoint ``unit``; call only after its outputs have been written."""
+    entry = {
+        "event": "unit",
+        "unit": unit,
+        "key": key,
+        "outputs": [self._relative(path) for path in outputs],
+        "data": data or {},
+    }
+    self._completed[unit] = entry
+    self._write(entry)
+
+  def finish(self) -> None:
+    """Discard the journal once the batch has fully completed."""
+    self.close()
+    if self.path.exists():
+      self.path.unlink()
+
+  def close(self) -> None:
+    if self._handle is not None:
+      self._handle.close()
+      self._handle = None
+
+  def _relative(self, path: Path) -> str:
+    path = Path(path)
+    if path.is_absolute():
+      path = path.relative_to(self.root)
+    return path.as_posix()
+
+  def _write(self, record: dict) -> None:
+    assert self._handle is not None
+    self._handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+    self._handle.flush()
+    os.fsync(self._handle.fileno())
+
+  def __enter__(self) -> "CheckpointJournal":
+    return self.open()
+
+  def __exit__(self, *exc_info: object) -> None:
+    self.close()
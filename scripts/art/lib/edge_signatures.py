@@ -0,0 +1,332 @@
+"""
+Hashed edge signatures for tileset seam and auto-tiling lookups.
+
+Comparing every tile edge against every other is quadratic in tile count.
+Instead, each side of every tile is reduced to a short key, and tiles are
+bucketed by ``(side, key)``. "Which tiles can sit to the right of this one?"
+is then a dictionary lookup: the bucket of the opposite side (``left``) under
+this tile's ``right`` key.
+
+Two keys are kept per side:
+
+* ``exact``: hash of the premultiplied RGBA boundary pixels, so colour hidden
+  under fully transparent pixels is ignored. One probe.
+* ``coarse``: the mean premultiplied colour and alpha coverage of each of
+  ``SEGMENTS`` equal edge segments, as integers 0-255, bucketed on a grid
+  ``CELL_SPAN * tolerance`` wide. It is only a candidate prefilter.
+
+Two edges are within tolerance when every premultiplied channel of every
+boundary pixel differs by at most ``tolerance``. Such edges also have coarse
+features within ``tolerance`` of each other (rounded segment means never
+drift further apart than the pixels), so a lookup that probes every grid cell
+the query's tolerance box overlaps (one or two per feature) is guaranteed to
+reach every match. Candidates in those cells are narrowed by their features
+and then checked pixel by pixel. Cells hold distinct edges, so tilesets that
+repeat one edge thousands of times cost a single comparison.
+
+Edges are read left-to-right (top/bottom) and top-to-bottom (left/right),
+so opposite sides line up pixel for pixel. Tile indices follow
+``analyzeTilesetSeams.js``: ``row * columns + column``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+SIDES = ("top", "right", "bottom", "left")
+OPPOSITE = {"top": "bottom", "right": "left", "bottom": "top", "left": "right"}
+DEFAULT_TILE_SIZE = 16
+DEFAULT_TOLERANCE = 8
+SIGNATURE_BYTES = 8
+SEGMENTS = 2
+# Grid cells are this many tolerances wide. At 2 or more, a tolerance box
+# overlaps at most two cells per feature.
+CELL_SPAN = 4
+
+Features = Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class TileRef:
+  tileset: str
+  index: int
+
+  def to_manifest(self) -> str:
+    return f"{self.tileset}#{self.index}"
+
+
+@dataclass(frozen=True)
+class TilesetLayout:
+  tileset: str
+  tile_size: int
+  columns: int
+  rows: int
+  empty_tiles: int
+
+
+def tile_grid(image: Image.Image, tile_size: int) -> np.ndarray:
+  """Premultiplied ``(rows, columns, tile_size, tile_size, 4)`` uint8 view of whole tiles."""
+  pixels = np.asarray(image.convert("RGBA"), dtype=np.uint16)
+  rows, columns = pixels.shape[0] // tile_size, pixels.shape[1] // tile_size
+  pixels = pixels[:rows * tile_size, :columns * tile_size]
+  premultiplied = pixels.copy()
+  premultiplied[..., :3] = (pixels[..., :3] * pixels[..., 3:] + 127) // 255
+  tiles = premultiplied.astype(np.uint8).reshape(rows, tile_size, columns, tile_size, 4)
+  return tiles.transpose(0, 2, 1, 3, 4)
+
+
+def tile_edges(tiles: np.ndarray) -> Dict[str, np.ndarray]:
+  """Boundary pixels per side, each ``(rows, columns, tile_size, 4)``."""
+  return {
+      "top": tiles[:, :, 0, :],
+      "right": tiles[:, :, :, -1],
+      "bottom": tiles[:, :, -1, :],
+      "left": tiles[:, :, :, 0],
+  }
+
+
+def hash_rows(rows: np.ndarray) -> List[str]:
+  """Hex signature per row of a 2D uint8 array, hashing each distinct row once."""
+  unique, inverse = np.unique(rows, axis=0, return_inverse=True)
+  digests = [
+      hashlib.blake2b(row.tobytes(), digest_size=SIGNATURE_BYTES).hexdigest()
+      for row in unique
+  ]
+  return [digests[position] for position in inverse.reshape(-1)]
+
+
+def coarse_features(edges: np.ndarray) -> np.ndarray:
+  """``(N, SEGMENTS * 4)`` uint8 segment means of ``(N, tile_size, 4)`` premultiplied edges."""
+  count, length, channels = edges.shape
+  segments = edges.reshape(count, SEGMENTS, length // SEGMENTS, channels).mean(axis=2)
+  return np.rint(segments).astype(np.uint8).reshape(count, SEGMENTS * channels)
+
+
+class EdgeSignatureIndex:
+  """``(side, key) -> tiles`` buckets for exact and within-tolerance edge matches."""
+
+  def __init__(self, tile_size: int = DEFAULT_TILE_SIZE,
+               tolerance: int = DEFAULT_TOLERANCE) -> None:
+    if tolerance < 1:
+      raise ValueError("Tolerance must be at least 1.")
+    if tile_size % SEGMENTS:
+      raise ValueError(f"Tile size must be a multiple of {SEGMENTS}.")
+    self.tile_size = tile_size
+    self.tolerance = tolerance
+    self.cell_size = CELL_SPAN * tolerance
+    self.layouts: Dict[str, TilesetLayout] = {}
+    self.signatures: Dict[TileRef, Dict[str, str]] = {}
+    self.features: Dict[TileRef, Dict[str, Features]] = {}
+    self.exact: Dict[Tuple[str, str], List[TileRef]] = defaultdict(list)
+    # One entry per distinct edge, keyed by ``(side, exact signature)``.
+    self.edge_pixels: Dict[Tuple[str, str], np.ndarray] = {}
+    self.edge_features: Dict[Tuple[str, str], Features] = {}
+    self.cells: Dict[Tuple[str, Features], List[str]] = defaultdict(list)
+    # Stacked int16 (features, pixels) of each cell's edges for vectorised filtering, built on demand.
+    self._cell_arrays: Dict[Tuple[str, Features], Tuple[np.ndarray, np.ndarray]] = {}
+
+  def add_tileset(self, tileset: str, image: Image.Image, skip_empty: bool = True) -> TilesetLayout:
+    """Index every whole tile of ``image``; fully transparent tiles are skipped by default."""
+    if tileset in self.layouts:
+      raise ValueError(f"Tileset already indexed: {tileset}")
+    tiles = tile_grid(image, self.tile_size)
+    rows, columns = tiles.shape[:2]
+    occupied = tiles[..., 3].reshape(rows * columns, -1).any(axis=1)
+    keep = occupied if skip_empty else np.ones_like(occupied)
+    kept_indices = np.flatnonzero(keep)
+    self._cell_arrays.clear()
+
+    per_side: Dict[str, Tuple[np.ndarray, List[str], List[Features], List[Features]]] = {}
+    for side, edges in tile_edges(tiles).items():
+      edges = edges.reshape(rows * columns, self.tile_size, 4)[kept_indices]
+      features = coarse_features(edges)
+      cells = features // self.cell_size
+      flat = edges.reshape(len(kept_indices), -1)
+      per_side[side] = (
+          flat,
+          hash_rows(flat),
+          [tuple(row) for row in features.tolist()],
+          [tuple(row) for row in cells.tolist()],
+      )
+
+    for position, tile_index in enumerate(kept_indices):
+      ref = TileRef(tileset, int(tile_index))
+      signatures: Dict[str, str] = {}
+      features: Dict[str, Features] = {}
+      for side in SIDES:
+        flat, hashes, coarse, cells = per_side[side]
+        exact = hashes[position]
+        signatures[side] = exact
+        features[side] = coarse[position]
+        self.exact[(side, exact)].append(ref)
+        if (side, exact) not in self.edge_pixels:
+          self.edge_pixels[(side, exact)] = flat[position].astype(np.int16)
+          self.edge_features[(side, exact)] = coarse[position]
+          self.cells[(side, cells[position])].append(exact)
+      self.signatures[ref] = signatures
+      self.features[ref] = features
+
+    layout = TilesetLayout(tileset, self.tile_size, columns, rows,
+                           int(rows * columns - kept_indices.size))
+    self.layouts[tileset] = layout
+    return layout
+
+  def signature(self, tile: TileRef, side: str) -> Optional[str]:
+    entry = self.signatures.get(tile)
+    return None if entry is None else entry[side]
+
+  def coarse_signature(self, tile: TileRef, side: str) -> Optional[Features]:
+    entry = self.features.get(tile)
+    return None if entry is None else entry[side]
+
+  def probe_cells(self, features: Sequence[int]) -> Iterable[Features]:
+    """Every grid cell overlapped by the tolerance box around ``features``."""
+    spans = []
+    for value in features:
+      low = max(0, value - self.tolerance) // self.cell_size
+      high = min(255, value + self.tolerance) // self.cell_size
+      spans.append((low,) if low == high else (low, high))
+    return itertools.product(*spans)
+
+  def within_tolerance(self, first: np.ndarray, second: np.ndarray) -> bool:
+    """Whether every pixel channel of two edges differs by at most ``tolerance``."""
+    return bool((np.abs(first - second) <= self.tolerance).all())
+
+  def tolerant_matches(self, side: str, signature: str) -> List[str]:
+    """Distinct opposite-side edges within tolerance of the ``side`` edge ``signature``."""
+    opposite = OPPOSITE[side]
+    features = self.edge_features[(side, signature)]
+    query_features = np.asarray(features, dtype=np.int16)
+    query_pixels = self.edge_pixels[(side, signature)]
+    matches: List[str] = []
+    for cell in self.probe_cells(features):
+      members = self.cells.get((opposite, cell))
+      if not members:
+        continue
+      arrays = self._cell_arrays.get((opposite, cell))
+      if arrays is None:
+        arrays = self._cell_arrays[(opposite, cell)] = (
+            np.asarray([self.edge_features[(opposite, member)] for member in members], dtype=np.int16),
+            np.stack([self.edge_pixels[(opposite, member)] for member in members]),
+        )
+      stacked_features, stacked_pixels = arrays
+      # The coarse features only narrow the candidates; the pixels decide.
+      candidates = np.flatnonzero((np.abs(stacked_features - query_features) <= self.tolerance).all(axis=1))
+      if candidates.size == 0:
+        continue
+      close = (np.abs(stacked_pixels[candidates] - query_pixels) <= self.tolerance).all(axis=1)
+      matches.extend(members[position] for position in candidates[close])
+    return matches
+
+  def neighbours(self, tile: TileRef, side: str, tolerant: bool = False) -> List[TileRef]:
+    """Tiles whose opposite edge matches ``tile``'s ``side`` edge (may include ``tile``)."""
+    opposite = OPPOSITE[side]
+    signature = self.signature(tile, side)
+    if signature is None:
+      return []
+    if not tolerant:
+      return list(self.exact.get((opposite, signature), ()))
+    return [
+        ref
+        for match in self.tolerant_matches(side, signature)
+        for ref in self.exact[(opposite, match)]
+    ]
+
+  def compatible(self, first: TileRef, side: str, second: TileRef,
+                 tolerant: bool = False) -> bool:
+    """Whether ``second`` may sit on ``first``'s ``side``."""
+    opposite = OPPOSITE[side]
+    signature = self.signature(first, side)
+    other = self.signature(second, opposite)
+    if signature is None or other is None:
+      return False
+    if not tolerant:
+      return signature == other
+    return self.within_tolerance(self.edge_pixels[(side, signature)],
+                                 self.edge_pixels[(opposite, other)])
+
+  def tiles(self, tileset: Optional[str] = None) -> Iterable[TileRef]:
+    return (ref for ref in self.signatures if tileset is None or ref.tileset == tileset)
+
+  def seam_report(self, tileset: str) -> dict:
+    """Dead-end edges and how many atlas-adjacent pairs already join seamlessly."""
+    layout = self.layouts[tileset]
+    refs = list(self.tiles(tileset))
+    dead_ends = {"exact": 0, "tolerant": 0}
+    # Many tiles share an edge; decide each distinct edge once.
+    tolerant_dead: Dict[Tuple[str, str], bool] = {}
+    for ref in refs:
+      for side in SIDES:
+        key = (side, self.signatures[ref][side])
+        if (OPPOSITE[side], key[1]) not in self.exact:
+          dead_ends["exact"] += 1
+        if key not in tolerant_dead:
+          tolerant_dead[key] = not self.tolerant_matches(*key)
+        dead_ends["tolerant"] += tolerant_dead[key]
+
+    pairs = 0
+    joined = {"exact": 0, "tolerant": 0}
+    for ref in refs:
+      row, column = divmod(ref.index, layout.columns)
+      for side, (d_row, d_column) in (("right", (0, 1)), ("bottom", (1, 0))):
+        if row + d_row >= layout.rows or column + d_column >= layout.columns:
+          continue
+        other = TileRef(tileset, (row + d_row) * layout.columns + column + d_column)
+        if other not in self.signatures:
+          continue
+        pairs += 1
+        joined["exact"] += self.compatible(ref, side, other)
+        joined["tolerant"] += self.compatible(ref, side, other, tolerant=True)
+
+    return {
+        "tiles": len(refs),
+        "emptyTiles": layout.empty_tiles,
+        "uniqueSignatures": {
+            "exact": len({self.signatures[ref][side] for ref in refs for side in SIDES}),
+            "coarse": len({self.features[ref][side] for ref in refs for side in SIDES}),
+        },
+        "deadEndEdges": dead_ends,
+        "adjacentPairs": pairs,
+        "joinedPairs": joined,
+    }
+
+  def to_manifest(self, include_buckets: bool = False) -> dict:
+    """Per-tile keys in ``SIDES`` order; the buckets are derivable from them and opt-in."""
+    manifest = {
+        "tileSize": self.tile_size,
+        "tolerance": self.tolerance,
+        "signatureBytes": SIGNATURE_BYTES,
+        "segments": SEGMENTS,
+        "cellSize": self.cell_size,
+        "sides": list(SIDES),
+        "opposite": OPPOSITE,
+        "tilesets": {
+            name: {"columns": layout.columns, "rows": layout.rows, "emptyTiles": layout.empty_tiles}
+            for name, layout in self.layouts.items()
+        },
+        "tiles": {
+            ref.to_manifest(): {
+                "exact": [self.signatures[ref][side] for side in SIDES],
+                "coarse": [list(self.features[ref][side]) for side in SIDES],
+            }
+            for ref in self.signatures
+        },
+    }
+    if include_buckets:
+      exact: Dict[str, Dict[str, List[str]]] = {side: {} for side in SIDES}
+      for (side, signature), refs in sorted(self.exact.items()):
+        exact[side][signature] = [ref.to_manifest() for ref in refs]
+      coarse: Dict[str, Dict[str, List[str]]] = {side: {} for side in SIDES}
+      for (side, cell), members in sorted(self.cells.items()):
+        coarse[side][".".join(map(str, cell))] = [
+            ref.to_manifest() for signature in members for ref in self.exact[(side, signature)]
+        ]
+      manifest["buckets"] = {"exact": exact, "coarse": coarse}
+    return manifest
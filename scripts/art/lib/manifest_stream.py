@@ -0,0 +1,75 @@
+"""
+Streaming NDJSON event log for long-running art batches.
+
+Each record is a single JSON object on its own line, flushed and synced as soon
+as the corresponding asset or frame is written. Downstream tooling can tail the
+file and start work before the consolidated manifest lands, and a crashed run
+still leaves a record of everything that finished.
+
+Record shape:
+    {"event": "start", "source": "<script>"}
+    {"event": "asset", ...}            # one per written output
+    {"event": "frame", ...}            # one per normalized frame, after its atlas (Kira pack)
+    {"event": "manifest", "path": "<consolidated manifest>", "count": N}
+
+The trailing ``manifest`` record marks the stream as complete.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import IO, Optional
+
+
+class ManifestStream:
+  """Append-only NDJSON writer; a stream without a path silently discards events."""
+
+  def __init__(self, path: Optional[Path], source: str) -> None:
+    self.path = path
+    self.source = source
+    self.count = 0
+    self._handle: Optional[IO[str]] = None
+
+  @property
+  def enabled(self) -> bool:
+    return self.path is not None
+
+  def open(self) -> "ManifestStream":
+    if self.path is None:
+      return self
+    self.path.parent.mkdir(parents=True, exist_ok=True)
+    self._handle = self.path.open("w", encoding="utf-8")
+    self._write({"event": "start", "source": self.source})
+    return self
+
+  def emit(self, event: str, **payload: object) -> None:
+    """Write one record; ``asset`` records count towards the final total."""
+    if self._handle is None:
+      return
+    if event == "asset":
+      self.count += 1
+    self._write({"event": event, **payload})
+
+  def finish(self, manifest_path: Path, root: Optional[Path] = None) -> None:
+    """Emit the closing record pointing at the consolidated manifest."""
+    path = manifest_path.relative_to(root) if root is not None else manifest_path
+    self.emit("manifest", path=str(path).replace("\\", "/"), count=self.count)
+
+  def close(self) -> None:
+    if self._handle is not None:
+      self._handle.close()
+      self._handle = None
+
+  def _write(self, record: dict) -> None:
+    assert self._handle is not None
+    self._handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+    self._handle.flush()
+    os.fsync(self._handle.fileno())
+
+  def __enter__(self) -> "ManifestStream":
+    return self.open()
+
+  def __exit__(self, *exc_info: object) -> None:
+    self.close()
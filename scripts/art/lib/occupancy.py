@@ -0,0 +1,157 @@
+"""
+Summed-area-table occupancy index over a sprite sheet's alpha mask.
+
+After one O(W*H) cumulative sum, "how many opaque pixels are in this
+rectangle?" costs four lookups. Segmentation code uses that to skip empty
+space instead of visiting every pixel:
+
+* ``occupied_runs`` finds gutter-separated spans of columns or rows.
+* ``partition`` recursively cuts a region along empty gutters (XY-cut). No
+  8-connected component can straddle an empty row or column, so every
+  component lies wholly inside one returned leaf.
+* ``detect_grid`` recognises sheets laid out on a regular pitch, and
+  ``grid_regions`` then yields only the non-empty cells.
+* ``tighten`` shrinks a rectangle to the bounding box of its opaque pixels.
+
+All rectangles use inclusive ``(x0, y0, x1, y1)`` pixel coordinates, matching
+the bounding boxes used by the art scripts.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+Rect = Tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class GridLayout:
+  cell_width: int
+  cell_height: int
+  columns: int
+  rows: int
+
+
+class OccupancyIndex:
+  """O(1) opaque-pixel counts for any axis-aligned rectangle of a mask."""
+
+  def __init__(self, mask: np.ndarray) -> None:
+    self.height, self.width = mask.shape
+    self.table = np.zeros((self.height + 1, self.width + 1), dtype=np.int64)
+    np.cumsum(np.cumsum(mask, axis=0, dtype=np.int64), axis=1, out=self.table[1:, 1:])
+
+  @classmethod
+  def from_alpha(cls, image: Image.Image, threshold: int,
+                 inclusive: bool = True) -> "OccupancyIndex":
+    """Index pixels whose alpha is ``>= threshold`` (or ``> threshold``)."""
+    alpha = np.asarray(image.getchannel("A"))
+    return cls(alpha >= threshold if inclusive else alpha > threshold)
+
+  @property
+  def bounds(self) -> Rect:
+    return (0, 0, self.width - 1, self.height - 1)
+
+  def count(self, x0: int, y0: int, x1: int, y1: int) -> int:
+    table = self.table
+    return int(table[y1 + 1, x1 + 1] - table[y0, x1 + 1] - table[y1 + 1, x0] + table[y0, x0])
+
+  def column_counts(self, rect: Optional[Rect] = None) -> np.ndarray:
+    """Opaque pixels per column within ``rect``, computed from the table in one slice."""
+    x0, y0, x1, y1 = rect or self.bounds
+    band = self.table[y1 + 1, x0:x1 + 2] - self.table[y0, x0:x1 + 2]
+    return np.diff(band)
+
+  def row_counts(self, rect: Optional[Rect] = None) -> np.ndarray:
+    x0, y0, x1, y1 = rect or self.bounds
+    band = self.table[y0:y1 + 2, x1 + 1] - self.table[y0:y1 + 2, x0]
+    return np.diff(band)
+
+  def occupied_runs(self, axis: int, rect: Optional[Rect] = None) -> List[Tuple[int, int]]:
+    """Inclusive spans of non-empty columns (``axis=0``) or rows (``axis=1``) in ``rect``."""
+    rect = rect or self.bounds
+    counts = self.column_counts(rect) if axis == 0 else self.row_counts(rect)
+    origin = rect[0] if axis == 0 else rect[1]
+    occupied = np.concatenate(([False], counts > 0, [False]))
+    edges = np.flatnonzero(np.diff(occupied.astype(np.int8)))
+    return [(origin + int(start), origin + int(stop) - 1)
+            for start, stop in zip(edges[::2], edges[1::2])]
+
+  def tighten(self, rect: Optional[Rect] = None) -> Optional[Rect]:
+    """Bounding box of the opaque pixels in ``rect``, or ``None`` if it is empty."""
+    rect = rect or self.bounds
+    columns = self.occupied_runs(0, rect)
+    if not columns:
+      return None
+    rows = self.occupied_runs(1, rect)
+    return (columns[0][0], rows[0][0], columns[-1][1], rows[-1][1])
+
+  def partition(self, rect: Optional[Rect] = None) -> List[Rect]:
+    """Recursively split ``rect`` along empty gutters into tight, non-empty leaves."""
+    start = self.tighten(rect)
+    if start is None:
+      return []
+
+    leaves: List[Rect] = []
+    pending = [start]
+    while pending:
+      region = pending.pop()
+      x0, y0, x1, y1 = region
+      rows = self.occupied_runs(1, region)
+      if len(rows) > 1:
+        pending.extend(self.tighten((x0, top, x1, bottom)) for top, bottom in rows)
+        continue
+      columns = self.occupied_runs(0, region)
+      if len(columns) > 1:
+        pending.extend(self.tighten((left, y0, right, y1)) for left, right in columns)
+        continue
+      leaves.append(region)
+
+    leaves.sort(key=lambda leaf: (leaf[1], leaf[0]))
+    return leaves
+
+  def detect_grid(self, min_cells: int = 2) -> Optional[GridLayout]:
+    """Infer a regular cell pitch whose boundaries all fall inside empty gutters."""
+    pitch_x = _infer_pitch(self.occupied_runs(0), self.width, min_cells)
+    pitch_y = _infer_pitch(self.occupied_runs(1), self.height, min_cells)
+    if pitch_x is None and pitch_y is None:
+      return None
+    pitch_x = pitch_x or self.width
+    pitch_y = pitch_y or self.height
+    return GridLayout(pitch_x, pitch_y, -(-self.width // pitch_x), -(-self.height // pitch_y))
+
+  def grid_regions(self, layout: GridLayout) -> List[Rect]:
+    """Tight bounds of every non-empty cell, skipping empty cells in O(1) each."""
+    xs = np.minimum(np.arange(layout.columns + 1) * layout.cell_width, self.width)
+    ys = np.minimum(np.arange(layout.rows + 1) * layout.cell_height, self.height)
+    table = self.table
+    # Vectorised per-cell counts straight from the table corners.
+    counts = (table[np.ix_(ys[1:], xs[1:])] - table[np.ix_(ys[:-1], xs[1:])]
+              - table[np.ix_(ys[1:], xs[:-1])] + table[np.ix_(ys[:-1], xs[:-1])])
+
+    regions: List[Rect] = []
+    for row, column in zip(*np.nonzero(counts)):
+      cell = (int(xs[column]), int(ys[row]), int(xs[column + 1]) - 1, int(ys[row + 1]) - 1)
+      tight = self.tighten(cell)
+      if tight is not None:
+        regions.append(tight)
+    return regions
+
+
+def _infer_pitch(runs: List[Tuple[int, int]], extent: int, min_cells: int) -> Optional[int]:
+  """Smallest pitch (from run start spacing) under which every run stays in one cell."""
+  if len(runs) < min_cells:
+    return None
+  starts = np.array([start for start, _ in runs])
+  spacing = np.diff(starts)
+  if spacing.size == 0:
+    return None
+  for pitch in sorted({int(value) for value in spacing if value > 0}):
+    if pitch >= extent:
+      break
+    if all(start // pitch == stop // pitch for start, stop in runs):
+      return pitch
+  return None
@@ -0,0 +1,229 @@
+"""
+Seeded palette-swap LUTs for mass-producing recoloured sprite variants.
+
+Each base sprite is reduced once to an indexed form with two planes:
+  * tone index (0-255), in three bands:
+      - preserved: warm-hued pixels (skin, hair, warm leather) map to
+        ``PRESERVED_BASE ..`` entries of a palette quantised once from the
+        base sprites, so every variant keeps them as painted.
+      - accent: other saturated, not near-black pixels map to
+        ``0 .. TONE_LEVELS-1`` by luminance.
+      - neutral: everything else maps to ``TONE_LEVELS .. 2*TONE_LEVELS-1``,
+        also by luminance.
+  * alpha, copied unchanged.
+
+A variant is then just a 256-entry RGB lookup table. Accent tones are sampled
+from one of the faction's colour ramps, with a seeded hue shift and contrast
+curve. Neutral tones stay grey, pulled slightly toward the ramp. The preserved
+band is the same in every row. Recolouring
+every variant of every base sprite is a single NumPy gather,
+``luts[variant, index[base]]``, so hundreds of variants cost little more than
+writing them out.
+
+The same indexed planes and LUT rows can be shipped to the runtime (an
+index+alpha texture plus a LUT texture) for recolouring on the GPU.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from random import Random
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+TONE_LEVELS = 64
+PRESERVED_BASE = TONE_LEVELS * 2
+PRESERVED_COLOURS = 128
+LUT_SIZE = PRESERVED_BASE + PRESERVED_COLOURS
+ACCENT_SATURATION = 0.35
+ACCENT_MIN_VALUE = 0.12
+# Skin and hair: hues (degrees, wrapping through red) with at least a tint of saturation.
+PRESERVED_HUES = (340.0, 50.0)
+PRESERVED_MIN_SATURATION = 0.15
+HUE_JITTER_DEGREES = 12.0
+GAMMA_RANGE = (0.8, 1.25)
+NEUTRAL_TINT_RANGE = (0.05, 0.3)
+
+
+@dataclass(frozen=True)
+class ColourRamp:
+  """Dark-to-light colour stops (hex) sampled by tone."""
+
+  name: str
+  stops: Tuple[str, ...]
+
+  def to_manifest(self) -> dict:
+    return {"name": self.name, "stops": list(self.stops)}
+
+
+@dataclass(frozen=True)
+class LutSpec:
+  """Seeded recipe for one variant's LUT."""
+
+  base: int
+  ramp: str
+  hue_shift: float
+  gamma: float
+  neutral_tint: float
+
+  def to_manifest(self) -> dict:
+    return {
+        "ramp": self.ramp,
+        "hueShift": round(self.hue_shift, 3),
+        "gamma": round(self.gamma, 4),
+        "neutralTint": round(self.neutral_tint, 4),
+    }
+
+
+def hex_to_rgb(colour: str) -> Tuple[int, int, int]:
+  value = colour.lstrip("#")
+  return (int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16))
+
+
+def rgb_to_hsv(rgb: np.ndarray) -> np.ndarray:
+  """Vectorised RGB (0-1 floats, last axis) to HSV with hue in [0, 1)."""
+  maximum = rgb.max(axis=-1)
+  minimum = rgb.min(axis=-1)
+  delta = maximum - minimum
+  safe_delta = np.where(delta == 0, 1.0, delta)
+  red, green, blue = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+  hue = np.select(
+      [maximum == red, maximum == green],
+      [((green - blue) / safe_delta) % 6.0, (blue - red) / safe_delta + 2.0],
+      (red - green) / safe_delta + 4.0,
+  ) / 6.0
+  hue = np.where(delta == 0, 0.0, hue)
+  saturation = np.where(maximum == 0, 0.0, delta / np.where(maximum == 0, 1.0, maximum))
+  return np.stack([hue % 1.0, saturation, maximum], axis=-1)
+
+
+def hsv_to_rgb(hsv: np.ndarray) -> np.ndarray:
+  hue, saturation, value = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+  sector = np.floor(hue * 6.0)
+  fraction = hue * 6.0 - sector
+  p = value * (1.0 - saturation)
+  q = value * (1.0 - saturation * fraction)
+  t = value * (1.0 - saturation * (1.0 - fraction))
+  sector = sector.astype(np.int64) % 6
+  red = np.choose(sector, [value, q, p, p, t, value])
+  green = np.choose(sector, [t, value, value, q, p, p])
+  blue = np.choose(sector, [p, p, t, value, value, q])
+  return np.stack([red, green, blue], axis=-1)
+
+
+def preserved_mask(hsv: np.ndarray) -> np.ndarray:
+  """Pixels whose hue and saturation read as skin or hair."""
+  degrees = hsv[..., 0] * 360.0
+  start, end = PRESERVED_HUES
+  warm = (degrees >= start) | (degrees < end) if start > end else (degrees >= start) & (degrees < end)
+  return warm & (hsv[..., 1] >= PRESERVED_MIN_SATURATION) & (hsv[..., 2] >= ACCENT_MIN_VALUE)
+
+
+def quantise_preserved(pixels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+  """``(palette, indices)`` for ``(N, 3)`` uint8 pixels, at most ``PRESERVED_COLOURS`` entries."""
+  palette = np.zeros((PRESERVED_COLOURS, 3), dtype=np.uint8)
+  if not len(pixels):
+    return palette, np.zeros(0, dtype=np.uint8)
+  unique, inverse = np.unique(pixels, axis=0, return_inverse=True)
+  if len(unique) <= PRESERVED_COLOURS:
+    palette[:len(unique)] = unique
+    return palette, inverse.reshape(-1).astype(np.uint8)
+  strip = Image.fromarray(np.ascontiguousarray(pixels[None, :, :]), "RGB")
+  # Max-coverage seeding refined by k-means keeps every skin tone within a few levels.
+  quantised = strip.quantize(PRESERVED_COLOURS, method=Image.Quantize.MAXCOVERAGE, kmeans=4,
+                             dither=Image.Dither.NONE)
+  colours = np.array(quantised.getpalette()[:PRESERVED_COLOURS * 3], dtype=np.uint8).reshape(-1, 3)
+  palette[:len(colours)] = colours
+  return palette, np.asarray(quantised).reshape(-1)
+
+
+def index_sprites(sprites: Sequence[Image.Image]) -> Tuple[np.ndarray, np.ndarray]:
+  """Stack equally sized sprites into ``(count, height, width, 2)`` tone-index/alpha planes.
+
+  Also returns the ``(PRESERVED_COLOURS, 3)`` palette of the preserved band.
+  """
+  rgba = np.stack([np.asarray(sprite.convert("RGBA")) for sprite in sprites])
+  rgb = rgba[..., :3].astype(np.float64) / 255.0
+  hsv = rgb_to_hsv(rgb)
+  luminance = rgb @ np.array([0.299, 0.587, 0.114])
+  level = np.clip(np.rint(luminance * (TONE_LEVELS - 1)), 0, TONE_LEVELS - 1).astype(np.uint8)
+  accent = (hsv[..., 1] >= ACCENT_SATURATION) & (hsv[..., 2] >= ACCENT_MIN_VALUE)
+  index = np.where(accent, level, level + TONE_LEVELS).astype(np.uint8)
+
+  preserved = preserved_mask(hsv) & (rgba[..., 3] > 0)
+  palette, entries = quantise_preserved(rgba[..., :3][preserved])
+  index[preserved] = PRESERVED_BASE + entries
+  return np.stack([index, rgba[..., 3]], axis=-1), palette
+
+
+def sample_specs(ramps: Sequence[ColourRamp], count: int, base_count: int,
+                 rng: Random) -> List[LutSpec]:
+  """Draw ``count`` variant recipes, cycling through the base sprites."""
+  if not ramps:
+    raise ValueError("At least one colour ramp is required.")
+  specs = []
+  for variant in range(count):
+    specs.append(LutSpec(
+        base=variant % base_count,
+        ramp=rng.choice(ramps).name,
+        hue_shift=rng.uniform(-HUE_JITTER_DEGREES, HUE_JITTER_DEGREES),
+        gamma=rng.uniform(*GAMMA_RANGE),
+        neutral_tint=rng.uniform(*NEUTRAL_TINT_RANGE),
+    ))
+  return specs
+
+
+def build_luts(specs: Sequence[LutSpec], ramps: Sequence[ColourRamp],
+               preserved: np.ndarray) -> np.ndarray:
+  """``(len(specs), LUT_SIZE, 3)`` uint8 tables, one row per variant.
+
+  ``preserved`` is the palette returned by ``index_sprites``; it fills the
+  preserved band of every row unchanged.
+  """
+  by_name: Dict[str, ColourRamp] = {ramp.name: ramp for ramp in ramps}
+  tones = np.linspace(0.0, 1.0, TONE_LEVELS)
+  gammas = np.array([spec.gamma for spec in specs])[:, None]
+  curved = tones[None, :] ** gammas
+
+  ramp_colours = np.empty((len(specs), TONE_LEVELS, 3))
+  for row, spec in enumerate(specs):
+    stops = np.array([hex_to_rgb(stop) for stop in by_name[spec.ramp].stops], dtype=np.float64) / 255.0
+    positions = np.linspace(0.0, 1.0, len(stops))
+    for channel in range(3):
+      ramp_colours[row, :, channel] = np.interp(curved[row], positions, stops[:, channel])
+
+  hsv = rgb_to_hsv(ramp_colours)
+  shifts = np.array([spec.hue_shift for spec in specs])[:, None] / 360.0
+  hsv[..., 0] = (hsv[..., 0] + shifts) % 1.0
+  accents = hsv_to_rgb(hsv)
+
+  greys = np.repeat(tones[None, :, None], 3, axis=2)
+  tints = np.array([spec.neutral_tint for spec in specs])[:, None, None]
+  neutrals = greys * (1.0 - tints) + accents * tints
+
+  recoloured = np.clip(np.rint(np.concatenate([accents, neutrals], axis=1) * 255.0), 0, 255)
+  kept = np.broadcast_to(preserved, (len(specs), PRESERVED_COLOURS, 3))
+  return np.concatenate([recoloured.astype(np.uint8), kept], axis=1)
+
+
+def apply_luts(indexed: np.ndarray, luts: np.ndarray, bases: Sequence[int]) -> np.ndarray:
+  """Recolour all variants at once: ``(variants, height, width, 4)`` RGBA uint8."""
+  bases = np.asarray(bases, dtype=np.intp)
+  planes = indexed[bases]
+  rows = np.arange(len(bases))[:, None, None]
+  rgb = luts[rows, planes[..., 0]]
+  return np.concatenate([rgb, planes[..., 1:2]], axis=-1)
+
+
+def pack_index_atlas(indexed: np.ndarray) -> Image.Image:
+  """Lay the base sprites' index/alpha planes side by side as an ``LA`` texture."""
+  count, height, width, _ = indexed.shape
+  strip = indexed.transpose(1, 0, 2, 3).reshape(height, count * width, 2)
+  return Image.fromarray(np.ascontiguousarray(strip), "LA")
+
+
+def pack_lut_texture(luts: np.ndarray) -> Image.Image:
+  """One ``LUT_SIZE``-wide RGB row per variant."""
+  return Image.fromarray(np.ascontiguousarray(luts), "RGB")
@@ -0,0 +1,162 @@
+"""
+Persistent decoded-pixel cache backed by memory-mapped raw planes.
+
+Decoding the large AR-003/AR-004 generation sheets (PNG inflate plus the RGBA
+conversion) dominates start-up of every art script. The cache stores the
+converted pixels once as an uncompressed plane keyed by the SHA-256 of the
+source file, then maps it straight back in on later runs.
+
+Layout (one pair per source digest and mode):
+    .cache/art-pixels/<sha256>.<mode>.raw   row-major pixels, no header
+    .cache/art-pixels/<sha256>.<mode>.json  {"width", "height", "mode", "source", "sourcePath"}
+
+A miss for a source replaces its planes: entries whose ``sourcePath`` matches
+but whose digest does not are deleted before the new plane is stored, so
+re-generated sheets do not accumulate stale copies.
+
+The sidecar format is intentionally trivial so non-Python tooling can map the
+same planes without going through Pillow.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+
+from .atomic_io import write_bytes_atomic
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_CACHE_DIR = PROJECT_ROOT / ".cache" / "art-pixels"
+SUPPORTED_MODES = ("RGBA", "L")
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+  """Return the SHA-256 hex digest of a file's bytes."""
+  digest = hashlib.sha256()
+  with path.open("rb") as handle:
+    for chunk in iter(lambda: handle.read(chunk_size), b""):
+      digest.update(chunk)
+  return digest.hexdigest()
+
+
+class PixelCache:
+  """Decode-once cache returning read-only images backed by mapped files."""
+
+  def __init__(self, directory: Optional[Path] = DEFAULT_CACHE_DIR) -> None:
+    self.directory = directory
+    self.hits = 0
+    self.misses = 0
+
+  @property
+  def enabled(self) -> bool:
+    return self.directory is not None
+
+  def open_rgba(self, path: Path) -> Image.Image:
+    """Return the source as RGBA pixels."""
+    return self._open(path, "RGBA")
+
+  def open_alpha(self, path: Path) -> Image.Image:
+    """Return only the alpha plane of the source as an ``L`` image."""
+    return self._open(path, "L")
+
+  def _open(self, path: Path, mode: str) -> Image.Image:
+    if mode not in SUPPORTED_MODES:
+      raise ValueError(f"Unsupported cache mode: {mode}")
+    if self.directory is None:
+      return decode(path, mode)
+
+    digest = file_digest(path)
+    raw_path = self.directory / f"{digest}.{mode}.raw"
+    meta_path = self.directory / f"{digest}.{mode}.json"
+
+    if raw_path.exists() and meta_path.exists():
+      cached = self._map(raw_path, meta_path)
+      if cached is not None:
+        self.hits += 1
+        return cached
+
+    self.misses += 1
+    image = decode(path, mode)
+    self.prune_superseded(path, digest)
+    self._store(image, path, raw_path, meta_path)
+    return image
+
+  def prune_superseded(self, source: Path, digest: str) -> int:
+    """Delete cached planes of ``source`` that belong to an older digest; returns the count."""
+    if self.directory is None or not self.directory.is_dir():
+      return 0
+    source_path = cache_source_path(source)
+    removed = 0
+    for meta_path in self.directory.glob("*.json"):
+      if meta_path.name.startswith(f"{digest}."):
+        continue
+      try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+      except (OSError, ValueError):
+        continue
+      if "sourcePath" in meta:
+        superseded = meta["sourcePath"] == source_path
+      else:
+        # Sidecars written before sourcePath existed only carry the file name.
+        superseded = meta.get("source") == source.name
+      if not superseded:
+        continue
+      # Sidecar first: a plane without a sidecar is never mapped.
+      meta_path.unlink(missing_ok=True)
+      meta_path.with_suffix(".raw").unlink(missing_ok=True)
+      removed += 1
+    return removed
+
+  def _map(self, raw_path: Path, meta_path: Path) -> Optional[Image.Image]:
+    try:
+      meta = json.loads(meta_path.read_text(encoding="utf-8"))
+      size = (int(meta["width"]), int(meta["height"]))
+      mode = meta["mode"]
+    except (OSError, ValueError, KeyError):
+      return None
+
+    expected_bytes = size[0] * size[1] * len(mode)
+    if raw_path.stat().st_size != expected_bytes:
+      return None
+
+    with raw_path.open("rb") as handle:
+      mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    # Pillow keeps a reference to the buffer, so the mapping outlives this frame.
+    return Image.frombuffer(mode, size, mapped, "raw", mode, 0, 1)
+
+  def _store(self, image: Image.Image, source: Path, raw_path: Path,
+             meta_path: Path) -> None:
+    assert self.directory is not None
+    self.directory.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "width": image.width,
+        "height": image.height,
+        "mode": image.mode,
+        "source": source.name,
+        "sourcePath": cache_source_path(source),
+    }
+    # Write the plane before its sidecar so a sidecar always implies a complete plane.
+    write_bytes_atomic(raw_path, image.tobytes())
+    write_bytes_atomic(meta_path, (json.dumps(meta, indent=2) + "\n").encode("utf-8"))
+
+
+def cache_source_path(path: Path) -> str:
+  """Stable identity of a source: project-relative when possible, else absolute."""
+  resolved = path.resolve()
+  try:
+    return resolved.relative_to(PROJECT_ROOT).as_posix()
+  except ValueError:
+    return resolved.as_posix()
+
+
+def decode(path: Path, mode: str) -> Image.Image:
+  with Image.open(path) as source:
+    if mode == "L":
+      return source.convert("RGBA").getchannel("A")
+    return source.convert(mode)
+
@@ -0,0 +1,49 @@
+"""
+Helpers that keep pipeline outputs byte-identical for identical inputs.
+
+Downstream content-hash, CDN and diff-based caches only work if unchanged art
+produces unchanged bytes. PNGs are therefore written with pinned encoder
+settings and no inherited metadata, and manifests carry no wall-clock
+timestamp by default; scripts only add one on explicit opt-in (honouring
+``SOURCE_DATE_EPOCH``).
+"""
+
+from __future__ import annotations
+
+import io
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from PIL import Image
+
+from .atomic_io import write_bytes_atomic
+
+# Pinned explicitly so a Pillow default change cannot silently alter output bytes.
+PNG_COMPRESS_LEVEL = 6
+
+
+def encode_png(image: Image.Image) -> bytes:
+  """Encode ``image`` as PNG without ICC/text chunks carried over from its source."""
+  buffer = io.BytesIO()
+  image.save(
+      buffer,
+      format="PNG",
+      compress_level=PNG_COMPRESS_LEVEL,
+      optimize=False,
+      icc_profile=None,
+  )
+  return buffer.getvalue()
+
+
+def save_png(image: Image.Image, path: Path) -> None:
+  """Atomically save ``image`` with the pinned settings of ``encode_png``."""
+  write_bytes_atomic(path, encode_png(image))
+
+
+def build_timestamp() -> str:
+  """Return an ISO-8601 UTC timestamp, honouring ``SOURCE_DATE_EPOCH`` when set."""
+  epoch = os.environ.get("SOURCE_DATE_EPOCH")
+  moment = (datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+            if epoch else datetime.now(timezone.utc))
+  return moment.replace(tzinfo=None).isoformat() + "Z"
@@ -0,0 +1,133 @@
+"""
+Thread-safe, byte-bounded LRU cache for derived asset payloads.
+
+The asset-derivation service keeps encoded PNGs, manifest fragments and
+intermediate segmentation results in memory. Entries are bounded by total
+payload size rather than by count, because one large atlas costs as much as
+hundreds of 32px sprites. Hit, miss and eviction counters are exposed for the
+service's metrics endpoint.
+
+``get_or_create`` computes a missing entry at most once per key, even when
+several request threads ask for it at the same time. Each call counts exactly
+once: a miss when it ran the factory, a hit otherwise (including a thread that
+waited for another to finish creating the entry). Hits and misses are tallied
+per caller-chosen ``group`` so nested lookups do not skew the rate of the
+lookups a client actually sees.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+DEFAULT_GROUP = "default"
+
+
+class SizedLRU:
+  """Least-recently-used mapping of keys to ``bytes`` bounded by ``max_bytes``."""
+
+  def __init__(self, max_bytes: int) -> None:
+    if max_bytes <= 0:
+      raise ValueError("LRU capacity must be positive.")
+    self.max_bytes = max_bytes
+    self.current_bytes = 0
+    self.hits: Dict[str, int] = defaultdict(int)
+    self.misses: Dict[str, int] = defaultdict(int)
+    self.evictions = 0
+    self.rejected = 0
+    self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+    self._lock = threading.Lock()
+    self._pending: Dict[Hashable, threading.Lock] = {}
+
+  def __len__(self) -> int:
+    with self._lock:
+      return len(self._entries)
+
+  def get(self, key: Hashable, group: str = DEFAULT_GROUP) -> Optional[bytes]:
+    with self._lock:
+      value = self._touch(key)
+      if value is None:
+        self.misses[group] += 1
+      else:
+        self.hits[group] += 1
+      return value
+
+  def _touch(self, key: Hashable) -> Optional[bytes]:
+    """Uncounted lookup that marks ``key`` as recently used; hold ``_lock``."""
+    value = self._entries.get(key)
+    if value is not None:
+      self._entries.move_to_end(key)
+    return value
+
+  def put(self, key: Hashable, value: bytes) -> None:
+    """Insert ``value``, evicting the oldest entries; oversized values are not stored."""
+    size = len(value)
+    with self._lock:
+      previous = self._entries.pop(key, None)
+      if previous is not None:
+        self.current_bytes -= len(previous)
+      if size > self.max_bytes:
+        self.rejected += 1
+        return
+      self._entries[key] = value
+      self.current_bytes += size
+      while self.current_bytes > self.max_bytes:
+        _, evicted = self._entries.popitem(last=False)
+        self.current_bytes -= len(evicted)
+        self.evictions += 1
+
+  def get_or_create(self, key: Hashable, factory: Callable[[], bytes],
+                    group: str = DEFAULT_GROUP) -> Tuple[bytes, bool]:
+    """Return ``(value, created)`` for ``key``, running ``factory`` once on a miss."""
+    with self._lock:
+      value = self._touch(key)
+      if value is not None:
+        self.hits[group] += 1
+        return value, False
+      key_lock = self._pending.setdefault(key, threading.Lock())
+
+    try:
+      with key_lock:
+        # Another thread may have produced the value while this one waited.
+        with self._lock:
+          value = self._touch(key)
+        created = value is None
+        if created:
+          value = factory()
+          self.put(key, value)
+    finally:
+      with self._lock:
+        if self._pending.get(key) is key_lock:
+          del self._pending[key]
+    with self._lock:
+      if created:
+        self.misses[group] += 1
+      else:
+        self.hits[group] += 1
+    return value, created
+
+  def clear(self) -> None:
+    with self._lock:
+      self._entries.clear()
+      self.current_bytes = 0
+
+  def metrics(self, groups: Iterable[str] = ()) -> dict:
+    """Sizes and counters; ``groups`` are listed even before their first lookup."""
+    with self._lock:
+      return {
+          "entries": len(self._entries),
+          "bytes": self.current_bytes,
+          "maxBytes": self.max_bytes,
+          "lookups": {
+              group: hit_stats(self.hits[group], self.misses[group])
+              for group in sorted(set(groups) | set(self.hits) | set(self.misses))
+          },
+          "evictions": self.evictions,
+          "rejected": self.rejected,
+      }
+
+
+def hit_stats(hits: int, misses: int) -> dict:
+  lookups = hits + misses
+  return {"hits": hits, "misses": misses, "hitRate": hits / lookups if lookups else 0.0}
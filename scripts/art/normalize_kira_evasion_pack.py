@@ -5,22 +5,37 @@ Normalize the generated dash/slide atlas for Kira and merge it into the core spr
 Outputs:
 1. Normalized dash/slide atlas (image + manifest) under assets/generated/images/ar-003/.
 2. Updated core sprite sheet with normalized dash/slide rows.
+3. Optional NDJSON stream with one record per normalized frame and written output.
+4. Optional glow/outline/silhouette atlases laid out like the normalized atlas.
+
+Frame detection and each written atlas are checkpointed in a journal next to the
+manifest; rerun with --resume after a failure to skip completed steps.
 
 Usage:
-    python scripts/art/normalize_kira_evasion_pack.py
+    python scripts/art/normalize_kira_evasion_pack.py [--stream [PATH]] [--no-pixel-cache] [--effects]
+        [--timestamp] [--resume]
 """
 
 from __future__ import annotations
 
-import json
+import argparse
 import math
-from collections import deque
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Iterable, List, Sequence, Tuple
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 from PIL import Image
 
+from lib.atomic_io import write_json_atomic
+from lib.checkpoint_journal import CheckpointJournal
+from lib.manifest_stream import ManifestStream
+from lib.neon_effects import DEFAULT_SETTINGS, EFFECT_KINDS, bake_effects
+from lib.occupancy import OccupancyIndex
+from lib.pixel_cache import DEFAULT_CACHE_DIR, PixelCache, file_digest
+from lib.reproducible import build_timestamp, save_png
+from lib.resample import DEFAULT_REDUCING_GAP, SheetResampler
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
 SOURCE_PATH = PROJECT_ROOT / 'assets/generated/images/ar-003/image-ar-003-kira-evasion-pack.png'
@@ -31,6 +46,8 @@ CORE_SOURCE_CANDIDATES: Tuple[Path, ...] = (
 NORMALIZED_PACK_PATH = PROJECT_ROOT / 'assets/generated/images/ar-003/image-ar-003-kira-evasion-pack-normalized.png'
 NORMALIZED_CORE_PATH = PROJECT_ROOT / 'assets/generated/images/ar-003/image-ar-003-kira-core-pack-normalized.png'
 MANIFEST_PATH = PROJECT_ROOT / 'assets/generated/images/ar-003/image-ar-003-kira-evasion-pack-normalized.json'
+STREAM_PATH = PROJECT_ROOT / 'assets/generated/images/ar-003/image-ar-003-kira-evasion-pack-normalized.ndjson'
+JOURNAL_PATH = PROJECT_ROOT / 'assets/generated/images/ar-003/image-ar-003-kira-evasion-pack-normalized.journal.ndjson'
 
 FRAME_SIZE = 32
 ALPHA_THRESHOLD = 80
@@ -39,6 +56,8 @@ MIN_COMPONENT_HEIGHT = 100
 MARGIN = 12
 TARGET_HEIGHT = 28
 TARGET_WIDTH = 28
+DASH_FRAME_COUNT = 6
+SLIDE_FRAME_COUNT = 10
 
 
 @dataclass(frozen=True)
@@ -66,62 +85,108 @@ class ComponentBox:
     )
 
 
+@dataclass
+class BatchContext:
+  stream: ManifestStream
+  pixel_cache: PixelCache
+  journal: CheckpointJournal
+  with_effects: bool = False
+  with_timestamp: bool = False
+
+
 def find_components(image: Image.Image) -> List[ComponentBox]:
-  width, height = image.size
-  pixels = image.load()
-  visited = [[False] * width for _ in range(height)]
-  components: List[ComponentBox] = []
+  opaque = np.asarray(image.getchannel('A')) >= ALPHA_THRESHOLD
+  index = OccupancyIndex(opaque)
 
-  for y in range(height):
-    for x in range(width):
-      if visited[y][x]:
-        continue
-      if pixels[x, y][3] < ALPHA_THRESHOLD:
-        continue
+  # Components never straddle an empty gutter, so flood-fill only the occupied
+  # regions the summed-area table carves out and skip empty space entirely.
+  layout = index.detect_grid()
+  cells = index.grid_regions(layout) if layout is not None else [index.bounds]
 
-      queue: deque[Tuple[int, int]] = deque([(x, y)])
-      visited[y][x] = True
-
-      min_x = max_x = x
-      min_y = max_y = y
-      count = 0
-
-      while queue:
-        cx, cy = queue.popleft()
-        count += 1
-        min_x = min(min_x, cx)
-        max_x = max(max_x, cx)
-        min_y = min(min_y, cy)
-        max_y = max(max_y, cy)
-
-        for nx in (cx - 1, cx, cx + 1):
-          if nx < 0 or nx >= width:
-            continue
-          for ny in (cy - 1, cy, cy + 1):
-            if ny < 0 or ny >= height:
-              continue
-            if visited[ny][nx]:
-              continue
-            if pixels[nx, ny][3] < ALPHA_THRESHOLD:
-              continue
-            visited[ny][nx] = True
-            queue.append((nx, ny))
-
-      if count < MIN_COMPONENT_PIXELS or (max_y - min_y + 1) < MIN_COMPONENT_HEIGHT:
+  components: List[ComponentBox] = []
+  for cell in cells:
+    for region in index.partition(cell):
+      _, min_y, _, max_y = region
+      # Nothing inside a region this small or short can pass the component filters.
+      if index.count(*region) < MIN_COMPONENT_PIXELS or (max_y - min_y + 1) < MIN_COMPONENT_HEIGHT:
         continue
-
-      components.append(ComponentBox(min_x, min_y, max_x, max_y))
+      components.extend(flood_region(opaque, region))
 
   components.sort(key=lambda box: (box.min_y, box.min_x))
   return components
 
 
-def normalize_frame(image: Image.Image, box: ComponentBox) -> Image.Image:
-  width, height = image.size
-  expanded = box.expand((width, height), MARGIN)
-  crop = image.crop((expanded.min_x, expanded.min_y, expanded.max_x + 1, expanded.max_y + 1))
+def flood_region(opaque: np.ndarray, region: Tuple[int, int, int, int]) -> List[ComponentBox]:
+  """8-connected components of ``region`` via row runs merged with union-find."""
+  origin_x, origin_y, end_x, end_y = region
+  padded = np.pad(opaque[origin_y:end_y + 1, origin_x:end_x + 1], ((0, 0), (1, 1)))
+  edges = np.diff(padded.astype(np.int8), axis=1)
+  run_rows, run_starts = np.nonzero(edges == 1)
+  _, run_stops = np.nonzero(edges == -1)  # exclusive
+  run_rows = run_rows.tolist()
+  run_starts = run_starts.tolist()
+  run_stops = run_stops.tolist()
+
+  parent = list(range(len(run_rows)))
+
+  def find(run: int) -> int:
+    while parent[run] != run:
+      parent[run] = parent[parent[run]]
+      run = parent[run]
+    return run
+
+  # Runs in adjacent rows touch (8-connectivity) when their spans overlap once widened by one pixel.
+  previous_start = previous_end = 0
+  current_start = 0
+  for run in range(len(run_rows) + 1):
+    if run < len(run_rows) and run_rows[run] == run_rows[current_start]:
+      continue
+    row = run_rows[current_start]
+    if current_start > 0 and run_rows[previous_start] == row - 1:
+      above = previous_start
+      for below in range(current_start, run):
+        while above < previous_end and run_stops[above] < run_starts[below]:
+          above += 1
+        candidate = above
+        while candidate < previous_end and run_starts[candidate] <= run_stops[below]:
+          root_a, root_b = find(candidate), find(below)
+          if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+          candidate += 1
+    previous_start, previous_end = current_start, run
+    current_start = run
+
+  boxes = {}
+  for run, row in enumerate(run_rows):
+    root = find(run)
+    length = run_stops[run] - run_starts[run]
+    box = boxes.get(root)
+    if box is None:
+      boxes[root] = [run_starts[run], row, run_stops[run] - 1, row, length]
+    else:
+      box[0] = min(box[0], run_starts[run])
+      box[2] = max(box[2], run_stops[run] - 1)
+      box[3] = row
+      box[4] += length
 
-  original_width, original_height = crop.size
+  components: List[ComponentBox] = []
+  for min_x, min_y, max_x, max_y, count in boxes.values():
+    if count < MIN_COMPONENT_PIXELS or (max_y - min_y + 1) < MIN_COMPONENT_HEIGHT:
+      continue
+    components.append(ComponentBox(
+      origin_x + min_x,
+      origin_y + min_y,
+      origin_x + max_x,
+      origin_y + max_y,
+    ))
+  return components
+
+
+def frame_geometry(image_size: Tuple[int, int], box: ComponentBox) -> Tuple[ComponentBox, Tuple[int, int]]:
+  """Expanded source rectangle for ``box`` and the size it is resampled to."""
+  expanded = box.expand(image_size, MARGIN)
+
+  original_width, original_height = expanded.width, expanded.height
   scale = min(
     TARGET_WIDTH / original_width,
     TARGET_HEIGHT / original_height,
@@ -132,7 +197,28 @@ def normalize_frame(image: Image.Image, box: ComponentBox) -> Image.Image:
 
   resized_width = max(1, int(math.ceil(original_width * scale)))
   resized_height = max(1, int(math.ceil(original_height * scale)))
-  resized = crop.resize((resized_width, resized_height), Image.LANCZOS)
+  return expanded, (resized_width, resized_height)
+
+
+def frame_resampler(image: Image.Image, boxes: Sequence[ComponentBox]) -> SheetResampler:
+  """Share one pre-reduced copy of the sheet across every frame it yields."""
+  requests = []
+  for box in boxes:
+    expanded, size = frame_geometry(image.size, box)
+    requests.append(((expanded.min_x, expanded.min_y, expanded.max_x, expanded.max_y), size))
+  return SheetResampler.for_crops(image, requests)
+
+
+def normalize_frame(
+  image: Image.Image,
+  box: ComponentBox,
+  resampler: Optional[SheetResampler] = None,
+) -> Image.Image:
+  expanded, (resized_width, resized_height) = frame_geometry(image.size, box)
+  rect = (expanded.min_x, expanded.min_y, expanded.max_x, expanded.max_y)
+  if resampler is None:
+    resampler = frame_resampler(image, [box])
+  resized = resampler.resize(rect, (resized_width, resized_height), Image.LANCZOS)
 
   canvas = Image.new('RGBA', (FRAME_SIZE, FRAME_SIZE), (0, 0, 0, 0))
   offset_x = (FRAME_SIZE - resized_width) // 2
@@ -141,16 +227,77 @@ def normalize_frame(image: Image.Image, box: ComponentBox) -> Image.Image:
   return canvas
 
 
-def write_normalized_pack(dash_frames: Sequence[Image.Image], slide_frames: Sequence[Image.Image]) -> dict:
+def place_frame(canvas: Image.Image, frame: Image.Image, position: Tuple[int, int]) -> None:
+  """Composite ``frame`` into an atlas cell through its own alpha, as every Kira atlas does."""
+  canvas.paste(frame, position, frame)
+
+
+def atlas_cell(frame: Image.Image) -> Image.Image:
+  """``frame`` exactly as it appears in its cell of the normalized atlas."""
+  cell = Image.new('RGBA', frame.size, (0, 0, 0, 0))
+  place_frame(cell, frame, (0, 0))
+  return cell
+
+
+def box_bounds(box: ComponentBox) -> dict:
+  return {
+    'minX': box.min_x,
+    'minY': box.min_y,
+    'maxX': box.max_x,
+    'maxY': box.max_y,
+  }
+
+
+def normalize_frames(
+  image: Image.Image,
+  boxes: Sequence[ComponentBox],
+  resampler: SheetResampler,
+) -> List[Image.Image]:
+  return [normalize_frame(image, box, resampler) for box in boxes]
+
+
+def emit_frame_records(
+  stream: ManifestStream,
+  kind: str,
+  row: int,
+  boxes: Sequence[ComponentBox],
+  atlas: str,
+) -> None:
+  """Announce frames only once the atlas holding them is on disk."""
+  for column, box in enumerate(boxes):
+    stream.emit(
+      'frame',
+      kind=kind,
+      bounds=box_bounds(box),
+      normalizedColumn=column,
+      normalizedRow=row,
+      atlas=atlas,
+    )
+
+
+def compose_pack_atlas(
+  dash_frames: Sequence[Image.Image],
+  slide_frames: Sequence[Image.Image],
+  cell_size: int = FRAME_SIZE,
+  masked: bool = True,
+) -> Image.Image:
+  """Dash frames on row 0, slide frames on row 1; ``masked`` pastes each frame through its own alpha."""
   max_columns = max(len(dash_frames), len(slide_frames))
-  atlas = Image.new('RGBA', (FRAME_SIZE * max_columns, FRAME_SIZE * 2), (0, 0, 0, 0))
+  atlas = Image.new('RGBA', (cell_size * max_columns, cell_size * 2), (0, 0, 0, 0))
 
-  for index, frame in enumerate(dash_frames):
-    atlas.paste(frame, (index * FRAME_SIZE, 0), frame)
-  for index, frame in enumerate(slide_frames):
-    atlas.paste(frame, (index * FRAME_SIZE, FRAME_SIZE), frame)
+  for row, frames in enumerate((dash_frames, slide_frames)):
+    for index, frame in enumerate(frames):
+      position = (index * cell_size, row * cell_size)
+      if masked:
+        place_frame(atlas, frame, position)
+      else:
+        atlas.paste(frame, position)
+  return atlas
 
-  atlas.save(NORMALIZED_PACK_PATH)
+
+def write_normalized_pack(dash_frames: Sequence[Image.Image], slide_frames: Sequence[Image.Image]) -> dict:
+  max_columns = max(len(dash_frames), len(slide_frames))
+  save_png(compose_pack_atlas(dash_frames, slide_frames), NORMALIZED_PACK_PATH)
 
   return {
     'normalizedAtlas': str(NORMALIZED_PACK_PATH.relative_to(PROJECT_ROOT)).replace('\\', '/'),
@@ -162,6 +309,32 @@ def write_normalized_pack(dash_frames: Sequence[Image.Image], slide_frames: Sequ
   }
 
 
+def effect_atlas_path(effect: str) -> Path:
+  return NORMALIZED_PACK_PATH.with_name(f'{NORMALIZED_PACK_PATH.stem}-{effect}.png')
+
+
+def write_effect_atlases(dash_frames: Sequence[Image.Image], slide_frames: Sequence[Image.Image]) -> dict:
+  # Dash and slide frames share one batch so the whole pack is baked in a single pass.
+  effects = bake_effects([*dash_frames, *slide_frames])
+  split = len(dash_frames)
+  # Padded layers keep the normalized atlas's columns and rows in wider cells.
+  cell_size = FRAME_SIZE + 2 * DEFAULT_SETTINGS.padding
+
+  atlases = {}
+  for effect in EFFECT_KINDS:
+    layers = effects[effect]
+    path = effect_atlas_path(effect)
+    save_png(compose_pack_atlas(layers[:split], layers[split:], cell_size, masked=False), path)
+    atlases[effect] = str(path.relative_to(PROJECT_ROOT)).replace('\\', '/')
+
+  return {
+    'atlases': atlases,
+    'layout': 'normalizedAtlas',
+    'cellSize': cell_size,
+    'settings': DEFAULT_SETTINGS.to_manifest(),
+  }
+
+
 def resolve_core_source_path() -> Path:
   for candidate in CORE_SOURCE_CANDIDATES:
     if candidate.exists():
@@ -176,8 +349,9 @@ def merge_with_core_pack(
   dash_frames: Sequence[Image.Image],
   slide_frames: Sequence[Image.Image],
   core_source_path: Path,
+  pixel_cache: PixelCache,
 ) -> dict:
-  core = Image.open(core_source_path).convert('RGBA')
+  core = pixel_cache.open_rgba(core_source_path)
   original_columns = core.size[0] // FRAME_SIZE
   rows = core.size[1] // FRAME_SIZE
 
@@ -193,11 +367,11 @@ def merge_with_core_pack(
   merged.paste(blank_row, (0, slide_row * FRAME_SIZE))
 
   for index, frame in enumerate(dash_frames):
-    merged.paste(frame, (index * FRAME_SIZE, dash_row * FRAME_SIZE), frame)
+    place_frame(merged, frame, (index * FRAME_SIZE, dash_row * FRAME_SIZE))
   for index, frame in enumerate(slide_frames):
-    merged.paste(frame, (index * FRAME_SIZE, slide_row * FRAME_SIZE), frame)
+    place_frame(merged, frame, (index * FRAME_SIZE, slide_row * FRAME_SIZE))
 
-  merged.save(NORMALIZED_CORE_PATH)
+  save_png(merged, NORMALIZED_CORE_PATH)
 
   return {
     'coreSource': str(core_source_path.relative_to(PROJECT_ROOT)).replace('\\', '/'),
@@ -211,38 +385,141 @@ def merge_with_core_pack(
   }
 
 
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description='Normalize the Kira dash/slide pack and merge it into the core sheet.')
+  parser.add_argument(
+    '--stream',
+    nargs='?',
+    const=STREAM_PATH,
+    type=Path,
+    help=f'Emit NDJSON records as frames and outputs are written (default path: {STREAM_PATH.relative_to(PROJECT_ROOT)}).',
+  )
+  parser.add_argument(
+    '--no-pixel-cache',
+    action='store_true',
+    help=f'Decode sources from scratch instead of mapping cached pixels from {DEFAULT_CACHE_DIR.relative_to(PROJECT_ROOT)}.',
+  )
+  parser.add_argument(
+    '--effects',
+    action='store_true',
+    help='Also bake glow, outline and silhouette atlases matching the normalized atlas layout.',
+  )
+  parser.add_argument(
+    '--timestamp',
+    action='store_true',
+    help='Record a generatedAt timestamp (honours SOURCE_DATE_EPOCH). '
+    'Off by default so identical inputs produce a byte-identical manifest.',
+  )
+  parser.add_argument(
+    '--resume',
+    action='store_true',
+    help=f'Skip steps already checkpointed in {JOURNAL_PATH.relative_to(PROJECT_ROOT)} by an interrupted run.',
+  )
+  return parser.parse_args()
+
+
 def main() -> None:
-  if not SOURCE_PATH.exists():
-    raise FileNotFoundError(f'Source atlas not found: {SOURCE_PATH}')
-  core_source_path = resolve_core_source_path()
+  args = parse_args()
+  pixel_cache = PixelCache(None if args.no_pixel_cache else DEFAULT_CACHE_DIR)
+  journal = CheckpointJournal(JOURNAL_PATH, PROJECT_ROOT, resume=args.resume)
+  with ManifestStream(args.stream, 'normalize_kira_evasion_pack.py') as stream, journal:
+    run(BatchContext(stream, pixel_cache, journal, args.effects, args.timestamp))
+  journal.finish()
+  if journal.resumed_units:
+    print(f'Resumed {journal.resumed_units} checkpointed step(s) from {JOURNAL_PATH.relative_to(PROJECT_ROOT)}')
+
+
+def detect_frame_components(image: Image.Image, context: BatchContext, unit_key: str) -> List[ComponentBox]:
+  recorded = context.journal.lookup('components', unit_key)
+  if recorded is not None:
+    return [ComponentBox(**box) for box in recorded['boxes']]
 
-  image = Image.open(SOURCE_PATH).convert('RGBA')
   components = find_components(image)
-  if len(components) != 16:
-    raise RuntimeError(f'Expected 16 frame blobs, found {len(components)}')
+  expected = DASH_FRAME_COUNT + SLIDE_FRAME_COUNT
+  if len(components) != expected:
+    raise RuntimeError(f'Expected {expected} frame blobs, found {len(components)}')
+  context.journal.record('components', unit_key, [], {'boxes': [asdict(box) for box in components]})
+  return components
 
-  dash_components = components[:6]
-  slide_components = components[6:]
 
-  dash_frames = [normalize_frame(image, box) for box in dash_components]
-  slide_frames = [normalize_frame(image, box) for box in slide_components]
+def checkpointed_output(
+  context: BatchContext,
+  unit: str,
+  unit_key: str,
+  write: Callable[[], Tuple[dict, List[Path]]],
+) -> dict:
+  """Run ``write`` unless ``unit`` is already checkpointed; returns its manifest info."""
+  recorded = context.journal.lookup(unit, unit_key)
+  if recorded is not None:
+    context.stream.emit('asset', kind=unit, resumed=True, **recorded['info'])
+    return recorded['info']
+
+  info, outputs = write()
+  context.journal.record(unit, unit_key, outputs, {'info': info})
+  context.stream.emit('asset', kind=unit, **info)
+  return info
 
-  atlas_info = write_normalized_pack(dash_frames, slide_frames)
-  core_info = merge_with_core_pack(dash_frames, slide_frames, core_source_path)
+
+def run(context: BatchContext) -> None:
+  stream = context.stream
+  if not SOURCE_PATH.exists():
+    raise FileNotFoundError(f'Source atlas not found: {SOURCE_PATH}')
+  core_source_path = resolve_core_source_path()
+  source_digest = file_digest(SOURCE_PATH)
+  core_digest = file_digest(core_source_path)
+  detection_key = f'{source_digest}:{ALPHA_THRESHOLD}:{MIN_COMPONENT_PIXELS}:{MIN_COMPONENT_HEIGHT}'
+  frames_key = f'{detection_key}:{FRAME_SIZE}:{TARGET_WIDTH}x{TARGET_HEIGHT}:{MARGIN}:{DEFAULT_REDUCING_GAP}'
+
+  image = context.pixel_cache.open_rgba(SOURCE_PATH)
+  components = detect_frame_components(image, context, detection_key)
+
+  dash_components = components[:DASH_FRAME_COUNT]
+  slide_components = components[DASH_FRAME_COUNT:]
+
+  resampler = frame_resampler(image, components)
+  dash_frames = normalize_frames(image, dash_components, resampler)
+  slide_frames = normalize_frames(image, slide_components, resampler)
+
+  atlas_info = checkpointed_output(
+    context,
+    'normalizedAtlas',
+    frames_key,
+    lambda: (write_normalized_pack(dash_frames, slide_frames), [NORMALIZED_PACK_PATH]),
+  )
+  emit_frame_records(stream, 'dash', 0, dash_components, atlas_info['normalizedAtlas'])
+  emit_frame_records(stream, 'slide', 1, slide_components, atlas_info['normalizedAtlas'])
+  core_info = checkpointed_output(
+    context,
+    'normalizedCore',
+    f'{frames_key}:{core_digest}',
+    lambda: (
+      merge_with_core_pack(dash_frames, slide_frames, core_source_path, context.pixel_cache),
+      [NORMALIZED_CORE_PATH],
+    ),
+  )
+  effects_info = None
+  if context.with_effects:
+    effects_info = checkpointed_output(
+      context,
+      'effects',
+      f'{frames_key}:{DEFAULT_SETTINGS}:{DEFAULT_SETTINGS.padding}',
+      lambda: (
+        write_effect_atlases(dash_frames, slide_frames),
+        [effect_atlas_path(effect) for effect in EFFECT_KINDS],
+      ),
+    )
 
   manifest = {
     'source': str(SOURCE_PATH.relative_to(PROJECT_ROOT)).replace('\\', '/'),
     'coreSource': core_info['coreSource'],
-    'generatedAt': __import__('datetime').datetime.utcnow().isoformat() + 'Z',
+    'sourceDigests': {
+      'source': source_digest,
+      'coreSource': core_digest,
+    },
     'frameSize': FRAME_SIZE,
     'dashFrames': [
       {
-        'bounds': {
-          'minX': box.min_x,
-          'minY': box.min_y,
-          'maxX': box.max_x,
-          'maxY': box.max_y,
-        },
+        'bounds': box_bounds(box),
         'normalizedColumn': index,
         'normalizedRow': 0,
       }
@@ -250,12 +527,7 @@ def main() -> None:
     ],
     'slideFrames': [
       {
-        'bounds': {
-          'minX': box.min_x,
-          'minY': box.min_y,
-          'maxX': box.max_x,
-          'maxY': box.max_y,
-        },
+        'bounds': box_bounds(box),
         'normalizedColumn': index,
         'normalizedRow': 1,
       }
@@ -266,13 +538,21 @@ def main() -> None:
       'normalizedCore': core_info,
     },
   }
+  if effects_info is not None:
+    manifest['outputs']['effects'] = effects_info
+  if context.with_timestamp:
+    manifest['generatedAt'] = build_timestamp()
 
-  with MANIFEST_PATH.open('w', encoding='utf8') as handle:
-    json.dump(manifest, handle, indent=2)
+  write_json_atomic(MANIFEST_PATH, manifest, trailing_newline=False)
+  stream.finish(MANIFEST_PATH, PROJECT_ROOT)
 
   print(f'Wrote normalized atlas to {atlas_info["normalizedAtlas"]}')
   print(f'Updated core sprite sheet at {core_info["normalizedCore"]}')
+  if effects_info is not None:
+    print(f'Baked effect atlases: {", ".join(effects_info["atlases"].values())}')
   print(f'Manifest written to {MANIFEST_PATH.relative_to(PROJECT_ROOT)}')
+  if stream.enabled:
+    print(f'Streamed records written to {stream.path}')
 
 
 if __name__ == '__main__':
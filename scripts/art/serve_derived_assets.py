@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Serve derived art assets on demand from a local HTTP or Unix-socket endpoint.
+
+Instead of pre-running the batch scripts, tooling and the dev build can request
+just the derived assets a scene needs. The service wraps the same code paths
+as the batch scripts (``crop_and_scale``, ``normalize_frame`` and the
+placeholder generators), so responses match the batch outputs. Encoded PNGs,
+manifest fragments and per-sheet segmentation results are kept in a
+byte-bounded LRU. Cache keys include the source digest, so edited generation
+sheets are picked up without a restart.
+
+Routes (GET):
+    /health
+    /metrics                              LRU and pixel-cache hit/miss counters
+    /index.json                           every derivable asset and its URLs
+    /npc-variants/<faction>/<nn>.png      32x48 variant, nn is 1-based (civilian-01)
+    /npc-variants/<faction>/<nn>.json     entry matching variant-manifest.json
+    /kira-frames/<dash|slide>/<col>.png   32x32 normalized frame, col is 0-based
+    /kira-frames/<dash|slide>/<col>.json  bounds and atlas cell of the frame
+    /placeholders/<request-id>.png        AR placeholder rendered at full size
+    /placeholders/<request-id>.json
+
+PNG responses carry ``X-Derived-Cache: hit|miss``. ``/metrics`` counts those
+served lookups under ``cache.lookups.requests``, and the per-sheet segmentation
+lookups made while deriving them separately under ``cache.lookups.segmentation``.
+
+Usage:
+    python scripts/art/serve_derived_assets.py [--host HOST] [--port PORT] [--unix PATH]
+        [--cache-mb MB] [--no-pixel-cache] [--verbose]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import signal
+import socketserver
+import stat
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
+
+import deriveNpcSpriteVariants as npc_variants
+import generate_ar_placeholders as placeholders
+import normalize_kira_evasion_pack as kira_pack
+from lib.pixel_cache import DEFAULT_CACHE_DIR, PixelCache, file_digest
+from lib.reproducible import encode_png
+from lib.sized_lru import SizedLRU
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_MB = 64
+KIRA_ROWS = {"dash": 0, "slide": 1}
+# SizedLRU counter groups: what clients were served, and internal box detection.
+REQUESTS = "requests"
+SEGMENTATION = "segmentation"
+PNG_TYPE = "image/png"
+JSON_TYPE = "application/json"
+
+
+class NotFound(Exception):
+  """Raised for unknown routes, factions, frames or placeholder ids."""
+
+
+class DerivedAssetService:
+  """Derives assets on request and memoizes the encoded results."""
+
+  def __init__(self, cache: SizedLRU, pixel_cache: PixelCache) -> None:
+    self.cache = cache
+    self.pixel_cache = pixel_cache
+    self.definitions = placeholders.build_asset_definitions()
+    self.sheets = {kind: (sheet_name, count) for sheet_name, kind, count in npc_variants.SHEETS}
+    self._digests: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+    self._digest_lock = threading.Lock()
+
+  def source_digest(self, path: Path) -> str:
+    """SHA-256 of ``path``, rehashed only when its size or mtime changes."""
+    try:
+      info = path.stat()
+    except FileNotFoundError:
+      raise NotFound(f"Missing source: {path.relative_to(ROOT)}") from None
+    signature = (info.st_mtime_ns, info.st_size)
+    with self._digest_lock:
+      recorded = self._digests.get(path)
+    if recorded is not None and recorded[0] == signature:
+      return recorded[1]
+    digest = file_digest(path)
+    with self._digest_lock:
+      self._digests[path] = (signature, digest)
+    return digest
+
+  def lookup(self, key: Tuple, factory: Callable[[], bytes],
+             group: str = REQUESTS) -> Tuple[bytes, bool]:
+    """Cached payload for ``key`` plus whether it was a hit."""
+    payload, created = self.cache.get_or_create(key, factory, group)
+    return payload, not created
+
+  # NPC variants -----------------------------------------------------------
+
+  def npc_sheet(self, faction: str) -> Tuple[Path, int]:
+    if faction not in self.sheets:
+      raise NotFound(f"Unknown faction: {faction}")
+    sheet_name, count = self.sheets[faction]
+    return npc_variants.AR004_DIR / sheet_name, count
+
+  def npc_boxes(self, faction: str, digest: str) -> List[npc_variants.BoundingBox]:
+    path, count = self.npc_sheet(faction)
+
+    def segment() -> bytes:
+      with self.pixel_cache.open_rgba(path) as image:
+        boxes = npc_variants.cluster_pixels(image, count)
+      boxes.sort(key=lambda box: box.x0)
+      return json.dumps([[box.x0, box.y0, box.x1, box.y1] for box in boxes]).encode("utf-8")
+
+    payload, _ = self.lookup(("npc-boxes", faction, digest, npc_variants.CLUSTER_SEED), segment, SEGMENTATION)
+    return [npc_variants.BoundingBox(*box) for box in json.loads(payload)]
+
+  def npc_variant_png(self, faction: str, variant: int) -> Tuple[bytes, bool]:
+    path, count = self.npc_sheet(faction)
+    if not 1 <= variant <= count:
+      raise NotFound(f"{faction} has variants 01-{count:02d}")
+    digest = self.source_digest(path)
+
+    def derive() -> bytes:
+      box = self.npc_boxes(faction, digest)[variant - 1]
+      with self.pixel_cache.open_rgba(path) as image:
+        return encode_png(npc_variants.crop_and_scale(image, box))
+
+    return self.lookup(("npc-variant", faction, variant, digest), derive)
+
+  def npc_variant_fragment(self, faction: str, variant: int) -> dict:
+    _, count = self.npc_sheet(faction)
+    if not 1 <= variant <= count:
+      raise NotFound(f"{faction} has variants 01-{count:02d}")
+    entry = npc_variants.build_manifest_entry(faction, variant, f"{faction}-{variant:02d}.png")
+    entry["url"] = f"/npc-variants/{faction}/{variant:02d}.png"
+    return entry
+
+  # Kira frames ------------------------------------------------------------
+
+  def kira_boxes(self, digest: str) -> List[kira_pack.ComponentBox]:
+    def detect() -> bytes:
+      image = self.pixel_cache.open_rgba(kira_pack.SOURCE_PATH)
+      boxes = kira_pack.find_components(image)
+      expected = kira_pack.DASH_FRAME_COUNT + kira_pack.SLIDE_FRAME_COUNT
+      if len(boxes) != expected:
+        raise RuntimeError(f"Expected {expected} frame blobs, found {len(boxes)}")
+      return json.dumps([[box.min_x, box.min_y, box.max_x, box.max_y] for box in boxes]).encode("utf-8")
+
+    payload, _ = self.lookup(("kira-boxes", digest), detect, SEGMENTATION)
+    return [kira_pack.ComponentBox(*box) for box in json.loads(payload)]
+
+  def kira_frame_box(self, kind: str, column: int, digest: str) -> kira_pack.ComponentBox:
+    boxes = self.kira_boxes(digest)
+    if kind == "dash":
+      row_boxes = boxes[:kira_pack.DASH_FRAME_COUNT]
+    elif kind == "slide":
+      row_boxes = boxes[kira_pack.DASH_FRAME_COUNT:]
+    else:
+      raise NotFound(f"Unknown frame kind: {kind}")
+    if not 0 <= column < len(row_boxes):
+      raise NotFound(f"{kind} has columns 0-{len(row_boxes) - 1}")
+    return row_boxes[column]
+
+  def kira_frame_png(self, kind: str, column: int) -> Tuple[bytes, bool]:
+    digest = self.source_digest(kira_pack.SOURCE_PATH)
+    box = self.kira_frame_box(kind, column, digest)
+
+    def derive() -> bytes:
+      image = self.pixel_cache.open_rgba(kira_pack.SOURCE_PATH)
+      # Share the batch run's reduction factor and composite the frame the way
+      # the batch atlas does, so responses match the atlas cell byte for byte.
+      resampler = kira_pack.frame_resampler(image, self.kira_boxes(digest))
+      return encode_png(kira_pack.atlas_cell(kira_pack.normalize_frame(image, box, resampler)))
+
+    return self.lookup(("kira-frame", kind, column, digest, kira_pack.DEFAULT_REDUCING_GAP), derive)
+
+  def kira_frame_fragment(self, kind: str, column: int) -> dict:
+    digest = self.source_digest(kira_pack.SOURCE_PATH)
+    box = self.kira_frame_box(kind, column, digest)
+    return {
+        "bounds": kira_pack.box_bounds(box),
+        "normalizedColumn": column,
+        "normalizedRow": KIRA_ROWS[kind],
+        "frameSize": kira_pack.FRAME_SIZE,
+        "sourceDigest": digest,
+        "url": f"/kira-frames/{kind}/{column}.png",
+    }
+
+  # Placeholders -----------------------------------------------------------
+
+  def placeholder_definition(self, request_id: str) -> placeholders.AssetDefinition:
+    if request_id not in self.definitions:
+      raise NotFound(f"Unknown placeholder: {request_id}")
+    return self.definitions[request_id]
+
+  def placeholder_png(self, request_id: str) -> Tuple[bytes, bool]:
+    definition = self.placeholder_definition(request_id)
+    return self.lookup(
+        ("placeholder", request_id),
+        lambda: encode_png(placeholders.render_asset(definition)),
+    )
+
+  def placeholder_fragment(self, request_id: str) -> dict:
+    definition = self.placeholder_definition(request_id)
+    return {
+        "id": request_id,
+        "width": definition.size[0],
+        "height": definition.size[1],
+        "path": (placeholders.OUTPUT_DIR / f"{request_id}.png").as_posix(),
+        "url": f"/placeholders/{request_id}.png",
+    }
+
+  # Index and metrics ------------------------------------------------------
+
+  def index(self) -> dict:
+    npc = [
+        self.npc_variant_fragment(faction, variant)
+        for faction, (_, count) in self.sheets.items()
+        for variant in range(1, count + 1)
+    ]
+    kira = [
+        {"kind": kind, "column": column, "url": f"/kira-frames/{kind}/{column}.png"}
+        for kind, count in (("dash", kira_pack.DASH_FRAME_COUNT), ("slide", kira_pack.SLIDE_FRAME_COUNT))
+        for column in range(count)
+    ]
+    return {
+        "npcVariants": npc,
+        "kiraFrames": kira,
+        "placeholders": [self.placeholder_fragment(request_id) for request_id in self.definitions],
+    }
+
+  def metrics(self) -> dict:
+    return {
+        "cache": self.cache.metrics((REQUESTS, SEGMENTATION)),
+        "pixelCache": {
+            "enabled": self.pixel_cache.enabled,
+            "hits": self.pixel_cache.hits,
+            "misses": self.pixel_cache.misses,
+        },
+    }
+
+
+Route = Tuple[Pattern[str], Callable[..., Tuple[bytes, str, Optional[bool]]]]
+
+
+def build_routes(service: DerivedAssetService) -> List[Route]:
+  def as_json(data: object) -> bytes:
+    return (json.dumps(data, indent=2) + "\n").encode("utf-8")
+
+  def png(result: Tuple[bytes, bool]) -> Tuple[bytes, str, Optional[bool]]:
+    return result[0], PNG_TYPE, result[1]
+
+  def fragment(data: dict) -> Tuple[bytes, str, Optional[bool]]:
+    return as_json(data), JSON_TYPE, None
+
+  return [
+      (re.compile(r"/health"), lambda: (as_json({"status": "ok"}), JSON_TYPE, None)),
+      (re.compile(r"/metrics"), lambda: (as_json(service.metrics()), JSON_TYPE, None)),
+      (re.compile(r"/index\.json"), lambda: (as_json(service.index()), JSON_TYPE, None)),
+      (re.compile(r"/npc-variants/([a-z]+)/(\d+)\.png"),
+       lambda faction, variant: png(service.npc_variant_png(faction, int(variant)))),
+      (re.compile(r"/npc-variants/([a-z]+)/(\d+)\.json"),
+       lambda faction, variant: fragment(service.npc_variant_fragment(faction, int(variant)))),
+      (re.compile(r"/kira-frames/([a-z]+)/(\d+)\.png"),
+       lambda kind, column: png(service.kira_frame_png(kind, int(column)))),
+      (re.compile(r"/kira-frames/([a-z]+)/(\d+)\.json"),
+       lambda kind, column: fragment(service.kira_frame_fragment(kind, int(column)))),
+      (re.compile(r"/placeholders/([a-z0-9-]+)\.png"),
+       lambda request_id: png(service.placeholder_png(request_id))),
+      (re.compile(r"/placeholders/([a-z0-9-]+)\.json"),
+       lambda request_id: fragment(service.placeholder_fragment(request_id))),
+  ]
+
+
+def make_handler(routes: List[Route], verbose: bool) -> type:
+  class DerivedAssetHandler(BaseHTTPRequestHandler):
+    server_version = "DerivedAssets/1"
+
+    def do_GET(self) -> None:
+      path = self.path.split("?", 1)[0]
+      try:
+        for pattern, handler in routes:
+          match = pattern.fullmatch(path)
+          if match:
+            body, content_type, hit = handler(*match.groups())
+            self.respond(HTTPStatus.OK, body, content_type, hit)
+            return
+        raise NotFound(f"No route for {path}")
+      except NotFound as error:
+        self.respond_error(HTTPStatus.NOT_FOUND, str(error))
+      except Exception as error:  # noqa: BLE001 - report derivation failures to the client
+        self.respond_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(error).__name__}: {error}")
+
+    def respond(self, status: HTTPStatus, body: bytes, content_type: str,
+                hit: Optional[bool] = None) -> None:
+      self.send_response(status)
+      self.send_header("Content-Type", content_type)
+      self.send_header("Content-Length", str(len(body)))
+      self.send_header("Cache-Control", "no-cache")
+      if hit is not None:
+        self.send_header("X-Derived-Cache", "hit" if hit else "miss")
+      self.end_headers()
+      self.wfile.write(body)
+
+    def respond_error(self, status: HTTPStatus, message: str) -> None:
+      body = (json.dumps({"error": message}) + "\n").encode("utf-8")
+      self.respond(status, body, JSON_TYPE)
+
+    def address_string(self) -> str:
+      # Unix-socket peers have no (host, port) tuple.
+      if isinstance(self.client_address, tuple) and self.client_address:
+        return str(self.client_address[0])
+      return "unix"
+
+    def log_message(self, format: str, *args: object) -> None:
+      if verbose:
+        super().log_message(format, *args)
+
+  return DerivedAssetHandler
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+  daemon_threads = True
+
+
+def remove_stale_socket(path: Path) -> None:
+  try:
+    if stat.S_ISSOCK(path.stat().st_mode):
+      path.unlink()
+  except FileNotFoundError:
+    pass
+
+
+def interrupt(signum: int, frame: object) -> None:
+  raise KeyboardInterrupt
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+  parser.add_argument("--host", default=DEFAULT_HOST, help=f"TCP host to bind (default {DEFAULT_HOST}).")
+  parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"TCP port to bind (default {DEFAULT_PORT}).")
+  parser.add_argument("--unix", type=Path, help="Serve on this Unix socket path instead of TCP.")
+  parser.add_argument(
+      "--cache-mb",
+      type=float,
+      default=DEFAULT_CACHE_MB,
+      help=f"Upper bound on cached derived payloads in MiB (default {DEFAULT_CACHE_MB}).",
+  )
+  parser.add_argument(
+      "--no-pixel-cache",
+      action="store_true",
+      help="Decode source sheets from scratch instead of mapping cached pixels "
+      f"from {DEFAULT_CACHE_DIR.relative_to(ROOT)}.",
+  )
+  parser.add_argument("--verbose", action="store_true", help="Log every request to stderr.")
+  return parser.parse_args()
+
+
+def main() -> None:
+  args = parse_args()
+  # Placeholder manifest paths are project-relative, as in the batch script.
+  os.chdir(ROOT)
+  cache = SizedLRU(max(1, int(args.cache_mb * 1024 * 1024)))
+  pixel_cache = PixelCache(None if args.no_pixel_cache else DEFAULT_CACHE_DIR)
+  service = DerivedAssetService(cache, pixel_cache)
+  handler = make_handler(build_routes(service), args.verbose)
+
+  if args.unix is not None:
+    remove_stale_socket(args.unix)
+    server: socketserver.BaseServer = ThreadingUnixHTTPServer(str(args.unix), handler)
+    location = f"unix:{args.unix}"
+  else:
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    location = f"http://{args.host}:{server.server_address[1]}"
+
+  print(f"Serving derived assets on {location} (cache {args.cache_mb:g} MiB)", flush=True)
+  # Dev servers stop their helpers with SIGTERM; shut down as cleanly as on Ctrl+C.
+  signal.signal(signal.SIGTERM, interrupt)
+  try:
+    server.serve_forever()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.server_close()
+    if args.unix is not None:
+      remove_stale_socket(args.unix)
+    print(f"Cache metrics: {json.dumps(service.metrics()['cache'])}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,51 @@
+"""
+Shared fixtures for the art-script tests.
+
+Run with ``python -m pytest tests/scripts/art``; needs Pillow and NumPy
+(``scripts/art/requirements.txt``).
+"""
+
+from __future__ import annotations
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts" / "art"))
+
+import deriveNpcSpriteVariants as npc_variants  # noqa: E402
+
+
+@pytest.fixture
+def npc_tree(tmp_path, monkeypatch):
+  """Point the NPC batch at a copy of the AR-004 sheets under ``tmp_path``."""
+  ar004 = tmp_path / "assets" / "generated" / "images" / "ar-004"
+  ar004.mkdir(parents=True)
+  for sheet_name, _, _ in npc_variants.SHEETS:
+    shutil.copy(npc_variants.AR004_DIR / sheet_name, ar004 / sheet_name)
+  output_dir = ar004 / "variants"
+  patched = {
+      "ROOT": tmp_path,
+      "AR004_DIR": ar004,
+      "OUTPUT_DIR": output_dir,
+      "EFFECTS_DIR": output_dir / "effects",
+      "PALETTE_DIR": output_dir / "palette",
+      "MANIFEST_PATH": ar004 / "variant-manifest.json",
+      "STREAM_PATH": ar004 / "variant-manifest.ndjson",
+      "JOURNAL_PATH": ar004 / "variant-manifest.journal.ndjson",
+      "DEFAULT_CACHE_DIR": tmp_path / ".cache" / "art-pixels",
+  }
+  for name, value in patched.items():
+    monkeypatch.setattr(npc_variants, name, value)
+  return ar004
+
+
+@pytest.fixture
+def run_npc_batch(npc_tree, monkeypatch):
+  """Run ``deriveNpcSpriteVariants.main`` in ``npc_tree`` with extra CLI arguments."""
+  def run(*args):
+    monkeypatch.setattr(sys, "argv", ["deriveNpcSpriteVariants.py", "--no-pixel-cache", *args])
+    npc_variants.main()
+  return run
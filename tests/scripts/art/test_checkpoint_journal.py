@@ -0,0 +1,168 @@
+"""
+Resume behaviour of ``lib.checkpoint_journal`` and ``lib.atomic_io``.
+
+The journal unit tests pin each skip/rerun rule. The batch test interrupts
+``deriveNpcSpriteVariants.py`` on a missing guard sheet (twice) inside a
+temporary tree and checks that ``--resume`` reuses the civilian sheet.
+
+Run with ``python -m pytest tests/scripts/art``; needs Pillow and NumPy
+(``scripts/art/requirements.txt``).
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts" / "art"))
+
+import deriveNpcSpriteVariants as npc_variants  # noqa: E402
+from lib.atomic_io import atomic_output, write_json_atomic  # noqa: E402
+from lib.checkpoint_journal import CheckpointJournal  # noqa: E402
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+  return tmp_path / "batch.journal.ndjson"
+
+
+def interrupted_run(journal_path, root, records):
+  """Record ``(unit, key, outputs, data)`` tuples, then stop without finishing."""
+  with CheckpointJournal(journal_path, root) as journal:
+    for unit, key, outputs, data in records:
+      journal.record(unit, key, outputs, data)
+
+
+def test_resume_reuses_recorded_data(tmp_path, journal_path):
+  output = tmp_path / "a.png"
+  output.write_bytes(b"a")
+  interrupted_run(journal_path, tmp_path, [("sheet:a", "k1", [output], {"entries": [1]})])
+
+  journal = CheckpointJournal(journal_path, tmp_path, resume=True)
+  assert journal.lookup("sheet:a", "k1") == {"entries": [1]}
+  assert journal.resumed_units == 1
+
+
+def test_outputs_are_recorded_relative_to_root(tmp_path, journal_path):
+  interrupted_run(journal_path, tmp_path, [("sheet:a", "k1", [tmp_path / "out" / "a.png"], None)])
+  record = json.loads(journal_path.read_text(encoding="utf-8"))
+  assert record["outputs"] == ["out/a.png"]
+
+
+def test_key_mismatch_invalidates_unit(tmp_path, journal_path):
+  interrupted_run(journal_path, tmp_path, [("sheet:a", "k1", [], {})])
+  journal = CheckpointJournal(journal_path, tmp_path, resume=True)
+  assert journal.lookup("sheet:a", "k2") is None
+  assert journal.resumed_units == 0
+
+
+def test_missing_output_forces_rerun(tmp_path, journal_path):
+  output = tmp_path / "a.png"
+  output.write_bytes(b"a")
+  interrupted_run(journal_path, tmp_path, [("sheet:a", "k1", [output], {})])
+  output.unlink()
+  assert CheckpointJournal(journal_path, tmp_path, resume=True).lookup("sheet:a", "k1") is None
+
+
+def test_without_resume_existing_checkpoints_are_ignored(tmp_path, journal_path):
+  interrupted_run(journal_path, tmp_path, [("sheet:a", "k1", [], {})])
+  with CheckpointJournal(journal_path, tmp_path) as journal:
+    assert journal.lookup("sheet:a", "k1") is None
+  assert journal_path.read_text(encoding="utf-8") == ""
+
+
+def test_truncated_last_line_is_tolerated(tmp_path, journal_path):
+  interrupted_run(journal_path, tmp_path, [("sheet:a", "k1", [], {"n": 1})])
+  with journal_path.open("a", encoding="utf-8") as handle:
+    handle.write('{"event":"unit","unit":"sheet:b","ke')
+
+  journal = CheckpointJournal(journal_path, tmp_path, resume=True)
+  assert journal.lookup("sheet:a", "k1") == {"n": 1}
+  assert journal.lookup("sheet:b", "k1") is None
+
+
+def test_checkpoints_survive_a_second_interruption(tmp_path, journal_path):
+  interrupted_run(journal_path, tmp_path, [("sheet:a", "k1", [], {"n": 1})])
+  with CheckpointJournal(journal_path, tmp_path, resume=True) as journal:
+    assert journal.lookup("sheet:a", "k1") == {"n": 1}
+    journal.record("sheet:b", "k1", [], {"n": 2})
+
+  journal = CheckpointJournal(journal_path, tmp_path, resume=True)
+  assert journal.lookup("sheet:a", "k1") == {"n": 1}
+  assert journal.lookup("sheet:b", "k1") == {"n": 2}
+
+
+def test_rerecording_a_unit_keeps_the_latest_entry(tmp_path, journal_path):
+  interrupted_run(journal_path, tmp_path, [("sheet:a", "k1", [], {"n": 1}), ("sheet:a", "k2", [], {"n": 2})])
+  journal = CheckpointJournal(journal_path, tmp_path, resume=True)
+  assert journal.lookup("sheet:a", "k1") is None
+  assert journal.lookup("sheet:a", "k2") == {"n": 2}
+
+
+def test_finish_deletes_the_journal(tmp_path, journal_path):
+  with CheckpointJournal(journal_path, tmp_path) as journal:
+    journal.record("sheet:a", "k1", [], {})
+  journal.finish()
+  assert not journal_path.exists()
+
+
+def test_atomic_output_keeps_previous_file_on_failure(tmp_path):
+  path = tmp_path / "manifest.json"
+  write_json_atomic(path, {"version": 1})
+  with pytest.raises(RuntimeError):
+    with atomic_output(path) as temp_path:
+      temp_path.write_text("{\"torn", encoding="utf-8")
+      raise RuntimeError("interrupted")
+  assert json.loads(path.read_text(encoding="utf-8")) == {"version": 1}
+  assert [entry.name for entry in tmp_path.iterdir()] == ["manifest.json"]
+
+
+def test_write_json_atomic_matches_json_dump_layout(tmp_path):
+  path = tmp_path / "manifest.json"
+  write_json_atomic(path, {"a": [1, 2]})
+  assert path.read_text(encoding="utf-8") == json.dumps({"a": [1, 2]}, indent=2) + "\n"
+
+
+def test_npc_batch_resumes_after_a_failed_sheet(npc_tree, run_npc_batch, capsys):
+  guard_sheet = npc_tree / "image-ar-004-npc-guard-pack.png"
+  parked = npc_tree.parent / guard_sheet.name
+  guard_sheet.rename(parked)
+
+  with pytest.raises(FileNotFoundError, match="Missing AR-004 sheet"):
+    run_npc_batch()
+  civilian = npc_tree / "variants" / "civilian-01.png"
+  first_write = civilian.stat().st_mtime_ns
+  assert not (npc_tree / "variant-manifest.json").exists()
+
+  # A second interruption must not lose the civilian checkpoint.
+  with pytest.raises(FileNotFoundError):
+    run_npc_batch("--resume")
+
+  parked.rename(guard_sheet)
+  capsys.readouterr()
+  run_npc_batch("--resume")
+  assert "Resumed 1 sheet(s)" in capsys.readouterr().out
+  assert civilian.stat().st_mtime_ns == first_write
+  assert not (npc_tree / "variant-manifest.journal.ndjson").exists()
+
+  manifest = json.loads((npc_tree / "variant-manifest.json").read_text(encoding="utf-8"))
+  expected = [(kind, variant) for _, kind, count in npc_variants.SHEETS for variant in range(1, count + 1)]
+  assert [(entry["faction"], entry["variant"]) for entry in manifest["generated"]] == expected
+
+
+def test_npc_batch_reruns_a_sheet_whose_source_changed(npc_tree, run_npc_batch, capsys):
+  guard_sheet = npc_tree / "image-ar-004-npc-guard-pack.png"
+  parked = npc_tree.parent / guard_sheet.name
+  guard_sheet.rename(parked)
+  with pytest.raises(FileNotFoundError):
+    run_npc_batch()
+  parked.rename(guard_sheet)
+
+  civilian_sheet = npc_tree / "image-ar-004-npc-civilian-pack.png"
+  civilian_sheet.write_bytes(civilian_sheet.read_bytes() + b"\0")
+  capsys.readouterr()
+  run_npc_batch("--resume")
+  assert "Resumed" not in capsys.readouterr().out
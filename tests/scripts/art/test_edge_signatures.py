@@ -0,0 +1,104 @@
+"""
+Lookup guarantees for ``lib.edge_signatures``.
+
+Tolerant neighbours must be exactly the tiles whose facing edge pixels all lie
+within tolerance, which a brute-force scan over every pair checks on random
+sheets. The coarse grid is only a prefilter and must never hide such a match.
+
+Run with ``python -m pytest tests/scripts/art``; needs Pillow and NumPy
+(``scripts/art/requirements.txt``).
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts" / "art"))
+
+from lib.edge_signatures import OPPOSITE, SIDES, EdgeSignatureIndex, TileRef, tile_edges, tile_grid  # noqa: E402
+
+
+def random_sheet(seed, tile_size=8, columns=8, rows=6):
+  """Tiles drawn from a few base colours plus noise, so near-matches straddle cell boundaries."""
+  rng = np.random.default_rng(seed)
+  bases = rng.integers(0, 256, size=(4, 4))
+  pixels = np.empty((rows * tile_size, columns * tile_size, 4), dtype=np.int16)
+  for row in range(rows):
+    for column in range(columns):
+      base = bases[rng.integers(len(bases))]
+      noise = rng.integers(-6, 7, size=(tile_size, tile_size, 4))
+      pixels[row * tile_size:(row + 1) * tile_size,
+             column * tile_size:(column + 1) * tile_size] = base + noise
+  return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), "RGBA")
+
+
+def brute_force_edges(index, image):
+  """Premultiplied edge pixels per ``(tile index, side)``, straight from the sheet."""
+  tiles = tile_grid(image, index.tile_size)
+  columns = tiles.shape[1]
+  return {
+      (row * columns + column, side): edges[row, column].astype(int)
+      for side, edges in tile_edges(tiles).items()
+      for row in range(tiles.shape[0])
+      for column in range(columns)
+  }
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("tolerance", [4, 8, 12])
+def test_tolerant_neighbours_match_brute_force(seed, tolerance):
+  index = EdgeSignatureIndex(tile_size=8, tolerance=tolerance)
+  sheets = {"a": random_sheet(seed), "b": random_sheet(100 + seed)}
+  edges = {}
+  for name, sheet in sheets.items():
+    index.add_tileset(name, sheet)
+    edges.update({(TileRef(name, tile), side): pixels
+                  for (tile, side), pixels in brute_force_edges(index, sheet).items()})
+  refs = list(index.signatures)
+  for ref in refs:
+    for side in SIDES:
+      expected = {
+          other for other in refs
+          if np.abs(edges[(ref, side)] - edges[(other, OPPOSITE[side])]).max() <= tolerance
+      }
+      found = index.neighbours(ref, side, tolerant=True)
+      assert len(found) == len(set(found))
+      assert set(found) == expected
+      for other in refs:
+        assert index.compatible(ref, side, other, tolerant=True) == (other in expected)
+
+
+def test_flat_edge_does_not_match_stripes_with_the_same_mean():
+  size = 8
+  pixels = np.zeros((size, size * 2, 4), dtype=np.uint8)
+  pixels[..., 3] = 255
+  pixels[:, :size, :3] = 128
+  pixels[:, size:, :3] = np.where(np.arange(size) % 2, 96, 160)[:, None, None]
+  index = EdgeSignatureIndex(tile_size=size, tolerance=8)
+  index.add_tileset("a", Image.fromarray(pixels, "RGBA"))
+  flat, stripes = TileRef("a", 0), TileRef("a", 1)
+  assert index.coarse_signature(flat, "right") == index.coarse_signature(stripes, "left")
+  assert not index.compatible(flat, "right", stripes, tolerant=True)
+  assert stripes not in index.neighbours(flat, "right", tolerant=True)
+
+
+def test_exact_neighbours_are_tolerant_neighbours():
+  index = EdgeSignatureIndex(tile_size=8, tolerance=2)
+  index.add_tileset("a", random_sheet(0))
+  for ref in index.features:
+    for side in SIDES:
+      assert set(index.neighbours(ref, side)) <= set(index.neighbours(ref, side, tolerant=True))
+
+
+def test_manifest_buckets_are_opt_in():
+  index = EdgeSignatureIndex(tile_size=8)
+  index.add_tileset("a", random_sheet(0))
+  assert "buckets" not in index.to_manifest()
+  buckets = index.to_manifest(include_buckets=True)["buckets"]
+  assert set(buckets) == {"exact", "coarse"}
+  assert sum(len(refs) for refs in buckets["coarse"]["left"].values()) == len(index.signatures)
@@ -0,0 +1,147 @@
+"""
+Equivalence checks for the Kira pack segmentation.
+
+``normalize_kira_evasion_pack.find_components`` replaced a per-pixel BFS with
+an occupancy-index XY-cut plus run-length union-find. These tests pin the new
+path to the original BFS (kept below as the reference) on randomised masks.
+
+Run with ``python -m pytest tests/scripts/art``; needs Pillow and NumPy
+(``scripts/art/requirements.txt``).
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import deque
+from pathlib import Path
+from random import Random
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts" / "art"))
+
+import normalize_kira_evasion_pack as kira_pack  # noqa: E402
+from lib.occupancy import OccupancyIndex  # noqa: E402
+
+
+def reference_components(opaque, min_pixels, min_height):
+  """The original 8-connected BFS from find_components, on a boolean mask."""
+  height, width = opaque.shape
+  visited = np.zeros_like(opaque, dtype=bool)
+  boxes = []
+  for y in range(height):
+    for x in range(width):
+      if visited[y, x] or not opaque[y, x]:
+        continue
+      queue = deque([(x, y)])
+      visited[y, x] = True
+      min_x = max_x = x
+      min_y = max_y = y
+      count = 0
+      while queue:
+        cx, cy = queue.popleft()
+        count += 1
+        min_x, max_x = min(min_x, cx), max(max_x, cx)
+        min_y, max_y = min(min_y, cy), max(max_y, cy)
+        for nx in (cx - 1, cx, cx + 1):
+          for ny in (cy - 1, cy, cy + 1):
+            if 0 <= nx < width and 0 <= ny < height and not visited[ny, nx] and opaque[ny, nx]:
+              visited[ny, nx] = True
+              queue.append((nx, ny))
+      if count >= min_pixels and (max_y - min_y + 1) >= min_height:
+        boxes.append(kira_pack.ComponentBox(min_x, min_y, max_x, max_y))
+  boxes.sort(key=lambda box: (box.min_y, box.min_x))
+  return boxes
+
+
+def random_mask(rng, width, height):
+  """Noise plus scattered blobs and strokes, so components touch, nest and cross gutters."""
+  mask = np.asarray([[rng.random() < rng.choice((0.0, 0.02, 0.1)) for _ in range(width)]
+                     for _ in range(height)])
+  for _ in range(rng.randint(0, 8)):
+    x0, y0 = rng.randrange(width), rng.randrange(height)
+    x1 = min(width, x0 + rng.randint(1, max(1, width // 2)))
+    y1 = min(height, y0 + rng.randint(1, max(1, height // 2)))
+    if rng.random() < 0.5:
+      mask[y0:y1, x0:x1] = True
+    else:
+      mask[y0:y1, x0:x1] |= np.asarray([[rng.random() < 0.6 for _ in range(x1 - x0)]
+                                        for _ in range(y1 - y0)])
+  for _ in range(rng.randint(0, 4)):
+    x, y = rng.randrange(width), rng.randrange(height)
+    for _ in range(rng.randint(5, 60)):
+      mask[y, x] = True
+      x = min(width - 1, max(0, x + rng.choice((-1, 0, 1))))
+      y = min(height - 1, max(0, y + rng.choice((-1, 0, 1))))
+  return mask
+
+
+def mask_image(mask):
+  alpha = np.where(mask, 255, 0).astype(np.uint8)
+  rgba = np.zeros(mask.shape + (4,), dtype=np.uint8)
+  rgba[..., 3] = alpha
+  return Image.fromarray(rgba, "RGBA")
+
+
+@pytest.fixture
+def small_filters(monkeypatch):
+  monkeypatch.setattr(kira_pack, "MIN_COMPONENT_PIXELS", 4)
+  monkeypatch.setattr(kira_pack, "MIN_COMPONENT_HEIGHT", 3)
+  return 4, 3
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_flood_region_matches_bfs(seed, small_filters):
+  rng = Random(seed)
+  mask = random_mask(rng, rng.randint(1, 48), rng.randint(1, 48))
+  height, width = mask.shape
+  found = sorted(kira_pack.flood_region(mask, (0, 0, width - 1, height - 1)),
+                 key=lambda box: (box.min_y, box.min_x))
+  assert found == reference_components(mask, *small_filters)
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_find_components_matches_bfs(seed, small_filters):
+  rng = Random(1000 + seed)
+  mask = random_mask(rng, rng.randint(1, 64), rng.randint(1, 64))
+  assert kira_pack.find_components(mask_image(mask)) == reference_components(mask, *small_filters)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_find_components_matches_bfs_on_gridded_sheets(seed, small_filters):
+  """Sprites laid out on a regular pitch exercise the detect_grid path."""
+  rng = Random(5000 + seed)
+  columns, rows, cell = rng.randint(2, 5), rng.randint(1, 4), rng.randint(10, 20)
+  mask = np.zeros((rows * cell, columns * cell), dtype=bool)
+  for row in range(rows):
+    for column in range(columns):
+      if rng.random() < 0.2:
+        continue
+      sprite = random_mask(rng, cell - 2, cell - 2)
+      mask[row * cell + 1:(row + 1) * cell - 1, column * cell + 1:(column + 1) * cell - 1] = sprite
+  assert kira_pack.find_components(mask_image(mask)) == reference_components(mask, *small_filters)
+
+
+def test_find_components_matches_bfs_with_default_filters():
+  rng = Random(7)
+  mask = np.zeros((240, 360), dtype=bool)
+  for _ in range(6):
+    x0, y0 = rng.randrange(300), rng.randrange(100)
+    mask[y0:y0 + rng.randint(60, 140), x0:x0 + rng.randint(4, 50)] = True
+  expected = reference_components(mask, kira_pack.MIN_COMPONENT_PIXELS, kira_pack.MIN_COMPONENT_HEIGHT)
+  assert kira_pack.find_components(mask_image(mask)) == expected
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_partition_keeps_components_whole(seed):
+  rng = Random(9000 + seed)
+  mask = random_mask(rng, rng.randint(1, 64), rng.randint(1, 64))
+  index = OccupancyIndex(mask)
+  leaves = index.partition(index.bounds)
+  for box in reference_components(mask, 1, 1):
+    assert any(
+        x0 <= box.min_x and box.max_x <= x1 and y0 <= box.min_y and box.max_y <= y1
+        for x0, y0, x1, y1 in leaves
+    )
@@ -0,0 +1,46 @@
+"""
+CLI and output-directory checks for the NPC palette-swap variants.
+
+Run with ``python -m pytest tests/scripts/art``; needs Pillow and NumPy
+(``scripts/art/requirements.txt``).
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+
+def palette_files(npc_tree):
+  return sorted(path.name for path in (npc_tree / "variants" / "palette").glob("*.png"))
+
+
+def manifest_palette_files(npc_tree):
+  manifest = json.loads((npc_tree / "variant-manifest.json").read_text(encoding="utf-8"))
+  names = [entry["path"].rsplit("/", 1)[-1] for entry in manifest["generated"] if "palette" in entry]
+  for packed in manifest.get("palette", {}).get("packed", {}).values():
+    names += [packed["indexTexture"].rsplit("/", 1)[-1], packed["lutTexture"].rsplit("/", 1)[-1]]
+  return sorted(names)
+
+
+def test_palette_pack_requires_palette_variants(run_npc_batch):
+  with pytest.raises(SystemExit, match="--palette-pack requires --palette-variants"):
+    run_npc_batch("--palette-pack")
+
+
+def test_negative_palette_variants_are_rejected(run_npc_batch):
+  with pytest.raises(SystemExit, match="must not be negative"):
+    run_npc_batch("--palette-variants", "-1")
+
+
+def test_smaller_rerun_removes_orphaned_palette_outputs(npc_tree, run_npc_batch):
+  run_npc_batch("--palette-variants", "3", "--palette-pack")
+  assert "civilian-08.png" in palette_files(npc_tree)
+  assert "guard-lut.png" in palette_files(npc_tree)
+
+  run_npc_batch("--palette-variants", "1")
+  assert palette_files(npc_tree) == manifest_palette_files(npc_tree) == ["civilian-06.png", "guard-04.png"]
+
+  run_npc_batch()
+  assert palette_files(npc_tree) == []
@@ -0,0 +1,59 @@
+"""
+Distance-field export checks for ``generate_ar_placeholders.py``.
+
+Thresholding each exported field at the 0.5 edge must give back exactly the
+pixels of its colour layer, so outlines and interior strokes survive the
+encoding instead of collapsing into the icon's filled silhouette.
+
+Run with ``python -m pytest tests/scripts/art``; needs Pillow and NumPy
+(``scripts/art/requirements.txt``).
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts" / "art"))
+
+import generate_ar_placeholders as placeholders  # noqa: E402
+from lib.distance_field import colour_mask  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def definitions():
+  return placeholders.build_asset_definitions()
+
+
+def decoded_edge(field):
+  return np.asarray(field) >= 128
+
+
+@pytest.mark.parametrize("request_id", list(placeholders.SDF_TARGETS))
+def test_layer_fields_reproduce_their_colour_masks(definitions, request_id):
+  canvas = placeholders.render_asset(definitions[request_id])
+  for layer, tint, field in placeholders.icon_sdf_layers(request_id, canvas):
+    assert field.size == canvas.size
+    assert np.array_equal(decoded_edge(field), colour_mask(canvas, tint)), layer
+
+
+def test_document_text_lines_survive_inside_the_page(definitions):
+  request_id = "image-ar-002-document"
+  canvas = placeholders.render_asset(definitions[request_id])
+  fields = {layer: decoded_edge(field)
+            for layer, _, field in placeholders.icon_sdf_layers(request_id, canvas)}
+  # A text line drawn across the page interior, and the page gap below it.
+  assert fields["ink"][12, 16]
+  assert not fields["ink"][15, 16]
+  assert fields["page"][15, 16]
+
+
+def test_layers_must_cover_every_opaque_pixel(definitions, monkeypatch):
+  request_id = "image-ar-002-document"
+  canvas = placeholders.render_asset(definitions[request_id])
+  monkeypatch.setitem(placeholders.SDF_TARGETS, request_id, placeholders.SDF_TARGETS[request_id][:2])
+  with pytest.raises(ValueError, match="cover every opaque pixel"):
+    placeholders.icon_sdf_layers(request_id, canvas)
@@ -0,0 +1,81 @@
+"""
+Parity checks between ``serve_derived_assets.py`` and the batch outputs.
+
+Served Kira frames must equal their cell of the normalized atlas, and served
+NPC variants the batch ``crop_and_scale`` output. Everything is derived in
+memory from the committed source sheets, so no batch run is needed.
+
+Run with ``python -m pytest tests/scripts/art``; needs Pillow and NumPy
+(``scripts/art/requirements.txt``).
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts" / "art"))
+
+import deriveNpcSpriteVariants as npc_variants  # noqa: E402
+import normalize_kira_evasion_pack as kira_pack  # noqa: E402
+import serve_derived_assets as service_module  # noqa: E402
+from lib.pixel_cache import PixelCache  # noqa: E402
+from lib.sized_lru import SizedLRU  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def service():
+  return service_module.DerivedAssetService(SizedLRU(64 * 1024 * 1024), PixelCache(None))
+
+
+@pytest.fixture(scope="module")
+def kira_atlas():
+  """The normalized atlas exactly as the batch run composes it."""
+  image = PixelCache(None).open_rgba(kira_pack.SOURCE_PATH)
+  components = kira_pack.find_components(image)
+  resampler = kira_pack.frame_resampler(image, components)
+  dash = kira_pack.normalize_frames(image, components[:kira_pack.DASH_FRAME_COUNT], resampler)
+  slide = kira_pack.normalize_frames(image, components[kira_pack.DASH_FRAME_COUNT:], resampler)
+  return np.asarray(kira_pack.compose_pack_atlas(dash, slide))
+
+
+def decode(payload):
+  with Image.open(io.BytesIO(payload)) as image:
+    return np.asarray(image.convert("RGBA"))
+
+
+@pytest.mark.parametrize("kind, column", [
+    *(("dash", column) for column in range(kira_pack.DASH_FRAME_COUNT)),
+    *(("slide", column) for column in range(kira_pack.SLIDE_FRAME_COUNT)),
+])
+def test_served_kira_frame_matches_atlas_cell(service, kira_atlas, kind, column):
+  payload, _ = service.kira_frame_png(kind, column)
+  size = kira_pack.FRAME_SIZE
+  row = service_module.KIRA_ROWS[kind]
+  cell = kira_atlas[row * size:(row + 1) * size, column * size:(column + 1) * size]
+  assert np.array_equal(decode(payload), cell)
+
+
+@pytest.mark.parametrize("faction", [kind for _, kind, _ in npc_variants.SHEETS])
+def test_served_npc_variants_match_batch_crops(service, faction):
+  sheet_name, count = service.sheets[faction]
+  with PixelCache(None).open_rgba(npc_variants.AR004_DIR / sheet_name) as image:
+    boxes = sorted(npc_variants.cluster_pixels(image, count), key=lambda box: box.x0)
+    expected = [np.asarray(npc_variants.crop_and_scale(image, box)) for box in boxes]
+  for variant, sprite in enumerate(expected, start=1):
+    payload, _ = service.npc_variant_png(faction, variant)
+    assert np.array_equal(decode(payload), sprite)
+
+
+def test_metrics_count_served_requests_apart_from_segmentation():
+  service = service_module.DerivedAssetService(SizedLRU(64 * 1024 * 1024), PixelCache(None))
+  hits = [service.npc_variant_png("civilian", variant)[1] for variant in (1, 2, 1, 3)]
+  assert hits == [False, False, True, False]
+  lookups = service.metrics()["cache"]["lookups"]
+  assert lookups["requests"] == {"hits": 1, "misses": 3, "hitRate": 0.25}
+  assert lookups["segmentation"] == {"hits": 2, "misses": 1, "hitRate": 2 / 3}
@@ -0,0 +1,89 @@
+"""
+Counting and eviction behaviour of ``lib.sized_lru.SizedLRU``.
+
+Run with ``python -m pytest tests/scripts/art``.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts" / "art"))
+
+from lib.sized_lru import DEFAULT_GROUP, SizedLRU  # noqa: E402
+
+
+def lookups(cache, group=DEFAULT_GROUP):
+  return cache.metrics((group,))["lookups"][group]
+
+
+def test_get_or_create_counts_once_per_call():
+  cache = SizedLRU(1024)
+  assert cache.get_or_create("a", lambda: b"x") == (b"x", True)
+  assert cache.get_or_create("a", lambda: b"y") == (b"x", False)
+  assert lookups(cache) == {"hits": 1, "misses": 1, "hitRate": 0.5}
+
+
+def test_waiting_thread_counts_as_hit():
+  cache = SizedLRU(1024)
+  started, release = threading.Event(), threading.Event()
+  results = []
+
+  def slow_factory():
+    started.set()
+    release.wait(5)
+    return b"payload"
+
+  creator = threading.Thread(target=lambda: results.append(cache.get_or_create("a", slow_factory)))
+  creator.start()
+  started.wait(5)
+  waiter = threading.Thread(target=lambda: results.append(cache.get_or_create("a", slow_factory)))
+  waiter.start()
+  # Let the waiter block on the key lock before the factory finishes.
+  time.sleep(0.05)
+  release.set()
+  creator.join(5)
+  waiter.join(5)
+
+  assert sorted(created for _, created in results) == [False, True]
+  assert lookups(cache) == {"hits": 1, "misses": 1, "hitRate": 0.5}
+
+
+def test_groups_are_counted_separately():
+  cache = SizedLRU(1024)
+  cache.get_or_create("boxes", lambda: b"b", "segmentation")
+  cache.get_or_create("png", lambda: b"p", "requests")
+  cache.get_or_create("boxes", lambda: b"b", "segmentation")
+  metrics = cache.metrics(("requests", "segmentation", "unused"))["lookups"]
+  assert metrics["requests"] == {"hits": 0, "misses": 1, "hitRate": 0.0}
+  assert metrics["segmentation"] == {"hits": 1, "misses": 1, "hitRate": 0.5}
+  assert metrics["unused"] == {"hits": 0, "misses": 0, "hitRate": 0.0}
+
+
+def test_failed_factory_can_be_retried():
+  cache = SizedLRU(1024)
+
+  def failing():
+    raise RuntimeError("boom")
+
+  with pytest.raises(RuntimeError):
+    cache.get_or_create("a", failing)
+  assert cache.get_or_create("a", lambda: b"x") == (b"x", True)
+  assert lookups(cache) == {"hits": 0, "misses": 1, "hitRate": 0.0}
+
+
+def test_evicts_least_recently_used_by_size():
+  cache = SizedLRU(8)
+  cache.put("a", b"aaaa")
+  cache.put("b", b"bbbb")
+  assert cache.get("a") == b"aaaa"
+  cache.put("c", b"cccc")
+  assert cache.get("b") is None
+  assert cache.metrics()["evictions"] == 1
+  cache.put("huge", b"x" * 9)
+  assert cache.metrics()["rejected"] == 1